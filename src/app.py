@@ -1,26 +1,50 @@
-from flask import Flask, render_template, request, jsonify, Response, send_file, redirect, url_for, session
+# Monkey-patch before anything else (threading, sockets) is imported so the
+# eventlet hub backs all blocking calls
+import eventlet
+eventlet.monkey_patch()
+from eventlet import tpool
+
+from flask import Flask, render_template, request, jsonify, Response, send_file, redirect, url_for, session, g, stream_with_context
 from flask_socketio import SocketIO
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from flask_cors import CORS
 from firebase_config import init_firebase, verify_google_token, db
+from firebase_service import FirebaseService
 from models.user import User
 from pathlib import Path
 from spotify_downloader import main, format_duration, parse_subtitle_file, sp
 import threading
 import os
+import mmap
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from dotenv import load_dotenv
-from database import DatabaseManager, DatabaseContextManager, DownloadedTrack, Playlist, PlaylistTrack, DownloadHistory
+from database import DatabaseManager, db_session, DownloadedTrack, Playlist, PlaylistTrack, DownloadHistory, Session as DbSession
 from datetime import datetime, timedelta
 from sqlalchemy.exc import SQLAlchemyError
+from concurrent.futures import ThreadPoolExecutor, Future
+from cachetools import TTLCache
+from functools import lru_cache
+import atexit
 import re
+import uuid
 import urllib.parse
 import sys
 import json
 import time
 import traceback
 
+# orjson serializes dicts of strings several times faster than stdlib json;
+# fall back quietly when it isn't installed
+try:
+    import orjson
+    def _json_bytes(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_bytes(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -33,11 +57,17 @@ logs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__
 os.makedirs(logs_dir, exist_ok=True)
 log_file = os.path.join(logs_dir, 'app.log')
 
-handler = RotatingFileHandler(log_file, maxBytes=10000, backupCount=1)
-handler.setLevel(logging.DEBUG)
+# Request threads only enqueue log records; a background listener drains the
+# queue to the rotating file so log I/O stays off the hot request path
 formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+file_handler = RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=5)
+file_handler.setLevel(logging.DEBUG)
+file_handler.setFormatter(formatter)
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+logger.addHandler(QueueHandler(log_queue))
 
 # Explicitly set the template and static folders
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -54,24 +84,378 @@ app.secret_key = os.getenv('FLASK_SECRET_KEY', 'default-dev-key-change-in-produc
 app.config['SESSION_COOKIE_SECURE'] = True
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
 
-# Print debugging information
-logger.info(f"Base Directory: {BASE_DIR}")
-logger.info(f"Template Directory: {TEMPLATE_DIR}")
-logger.info(f"Static Directory: {STATIC_DIR}")
-logger.info(f"Index HTML Path: {os.path.join(TEMPLATE_DIR, 'index.html')}")
-logger.info(f"Index HTML Exists: {os.path.exists(os.path.join(TEMPLATE_DIR, 'index.html'))}")
-
-# Initialize Flask-SocketIO
-socketio = SocketIO(app, cors_allowed_origins="*")
+# Print debugging information; stat the index template once and use lazy
+# %s formatting so nothing is rendered when INFO is filtered out
+_INDEX_HTML_PATH = os.path.join(TEMPLATE_DIR, 'index.html')
+_INDEX_EXISTS = os.path.exists(_INDEX_HTML_PATH)
+logger.info("Base Directory: %s", BASE_DIR)
+logger.info("Template Directory: %s", TEMPLATE_DIR)
+logger.info("Static Directory: %s", STATIC_DIR)
+logger.info("Index HTML Path: %s", _INDEX_HTML_PATH)
+logger.info("Index HTML Exists: %s", _INDEX_EXISTS)
+
+# Initialize Flask-SocketIO. Eventlet mode lets emits yield during network
+# sends instead of blocking request threads while holding the GIL.
+# A Redis message queue (REDIS_URL) lets SocketIO state shard across several
+# gunicorn eventlet workers without sticky sessions
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet',
+                    message_queue=os.environ.get('REDIS_URL'))
 
 # Import after socketio initialization to avoid circular imports
 from emit_utils import set_socketio_instance
 set_socketio_instance(socketio)
 
+class _EmitBatcher:
+    """Coalesce rapid-fire emits into periodic 'batch' frames.
+
+    Messages are buffered and flushed every `interval` seconds (or sooner when
+    `max_pending` messages queue up), so N back-to-back status updates cost one
+    WebSocket frame instead of N.
+    """
+
+    def __init__(self, sio, interval=0.05, max_pending=16):
+        self.sio = sio
+        self.interval = interval
+        self.max_pending = max_pending
+        self.buf = []
+        self.lock = threading.Lock()
+        self._task = None
+
+    def push(self, event, data):
+        with self.lock:
+            self.buf.append({'event': event, 'data': data})
+            flush_now = len(self.buf) >= self.max_pending
+            if self._task is None:
+                self._task = self.sio.start_background_task(self._drain)
+        if flush_now:
+            self._flush()
+
+    def _drain(self):
+        while True:
+            self.sio.sleep(self.interval)
+            self._flush()
+
+    def _flush(self):
+        with self.lock:
+            pending, self.buf = self.buf, []
+        if pending:
+            self.sio.emit('batch', pending)
+
+BATCHER = _EmitBatcher(socketio)
+
 # Initialize Firebase
 init_firebase()
 db = db
 
+# Bind the service singleton once at import; handlers reference this instead
+# of re-running get_instance() per request
+_firebase = FirebaseService.get_instance()
+
+# Downloads run as SocketIO background tasks (so status emits share the
+# eventlet hub), but the task count must stay bounded: this semaphore caps
+# how many download jobs run at once, and excess POSTs queue in their
+# greenlets until a slot frees up
+_download_slots = threading.Semaphore(int(os.getenv('DOWNLOAD_WORKERS', '4')))
+
+# General-purpose pool for fanning out batched Firestore commits (clear_history)
+_COMMIT_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv('DOWNLOAD_WORKERS', '4')),
+    thread_name_prefix='commit'
+)
+atexit.register(_COMMIT_POOL.shutdown, wait=False)
+
+# Pool for fanning out per-track filesystem work in get_user_tracks; each
+# task blocks on independent I/O, so threads overlap the waits
+_ANNOTATE_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix='tracks')
+atexit.register(_ANNOTATE_POOL.shutdown, wait=False)
+
+# URLs with a download currently in flight, used to dedupe repeat requests
+_active_downloads = set()
+
+# Download records are queued here and flushed by a single background writer,
+# which coalesces bursts into one batched Firestore commit instead of paying a
+# round trip inside every download
+_download_write_q = queue.Queue()
+
+def _download_writer():
+    while True:
+        items = [_download_write_q.get()]
+        time.sleep(0.1)
+        while not _download_write_q.empty():
+            items.append(_download_write_q.get_nowait())
+        try:
+            batch = db.batch()
+            for item in items:
+                batch.set(db.collection('downloads').document(), item)
+            # The writer "thread" is a greenlet after monkey_patch, and the
+            # gRPC commit bypasses eventlet's patched sockets — run it in a
+            # real tpool thread so the hub keeps serving while it's in flight
+            tpool.execute(batch.commit)
+            logger.info("Flushed %d download record(s) to Firebase", len(items))
+        except Exception as e:
+            logger.error(f"Firebase error: {e}")
+
+threading.Thread(target=_download_writer, daemon=True).start()
+
+# Single-track playlist adds land here; a writer coalesces a burst of POSTs
+# (one per dragged track) into one batched commit per playlist per 10ms window
+_playlist_add_q = queue.Queue()
+
+def _playlist_add_writer():
+    while True:
+        items = [_playlist_add_q.get()]
+        time.sleep(0.01)
+        while not _playlist_add_q.empty():
+            items.append(_playlist_add_q.get_nowait())
+        by_playlist = {}
+        for playlist_id, track_id, future in items:
+            by_playlist.setdefault(playlist_id, []).append((track_id, future))
+        for playlist_id, pairs in by_playlist.items():
+            try:
+                # gRPC write off the hub, same as the other Firestore calls
+                results = tpool.execute(
+                    _firebase.add_tracks_to_playlist,
+                    playlist_id, [tid for tid, _ in pairs])
+            except Exception as e:
+                logger.error(f"Error flushing playlist adds: {e}")
+                results = {}
+            for tid, future in pairs:
+                future.set_result(results.get(tid, False))
+
+threading.Thread(target=_playlist_add_writer, daemon=True).start()
+
+# Short-lived stat cache so repeated requests for the same media path during a
+# playback session don't hit the filesystem every time
+_stat_cache = TTLCache(maxsize=4096, ttl=5)
+
+def _remove_track_files(file_path):
+    """Delete a track file and its subtitle siblings.
+
+    EAFP: just attempt each unlink and swallow FileNotFoundError, which
+    halves the syscalls versus an exists() probe before every remove.
+    """
+    base_path = os.path.splitext(file_path)[0]
+    for path in [file_path] + [base_path + ext for ext in ('.srt', '.en.srt', '.vtt', '.en.vtt')]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error deleting {path}: {e}")
+
+def _get_track_for_request(firebase, track_id):
+    """Resolve a track for the current request by document id.
+
+    Track documents carry no per-user owner field, so a direct doc-get is
+    both the correct lookup and the cheapest one — a single keyed read,
+    no query or composite index involved. It is still a gRPC round trip,
+    so it runs off the hub like the other Firestore calls.
+    """
+    return tpool.execute(firebase.get_track_by_id, track_id)
+
+def _all_tracks():
+    """Fetch all tracks once per request, memoized on flask.g.
+
+    Firestore's gRPC transport bypasses eventlet's patched sockets, so the
+    call runs via tpool in a real OS thread while the serving greenlet
+    yields; other requests keep being handled during the round trip.
+    """
+    if 'all_tracks' not in g:
+        g.all_tracks = tpool.execute(_firebase.get_all_tracks)
+    return g.all_tracks
+
+def _all_playlists():
+    """Fetch all playlists once per request, memoized on flask.g."""
+    if 'all_playlists' not in g:
+        g.all_playlists = tpool.execute(_firebase.get_all_playlists)
+    return g.all_playlists
+
+# Matches only SRT timestamp commas so dialogue commas survive the VTT
+# conversion; compiled once and applied in a single C-level pass
+_SRT_TS_RE = re.compile(rb'(\d\d:\d\d:\d\d),(\d\d\d)')
+
+# Pulls the URL kind, object id and optional ?track= id out of a Spotify URL
+# in one pass, replacing the repeated split() chains in the download path
+_SPOTIFY_URL_RE = re.compile(r'(album|playlist|track)/([A-Za-z0-9]+)(?:\?\S*?track=([A-Za-z0-9]+))?')
+
+# Below this size the mmap setup costs more than it saves
+_MMAP_THRESHOLD = 16 * 1024
+
+@lru_cache(maxsize=512)
+def _vtt_for(path, size, mtime):
+    """Convert an SRT file to VTT bytes, cached by (path, size, mtime).
+
+    Larger files are mapped read-only so the regex pass runs straight over
+    the page cache without an intermediate read() copy.
+    """
+    with open(path, 'rb') as f:
+        if size >= _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return b"WEBVTT\n\n" + _SRT_TS_RE.sub(rb'\1.\2', mm)
+        return b"WEBVTT\n\n" + _SRT_TS_RE.sub(rb'\1.\2', f.read())
+
+@lru_cache(maxsize=512)
+def _lyrics_for(path, size, mtime):
+    """Parse a subtitle file into lyrics, cached by (path, size, mtime)."""
+    return parse_subtitle_file(path)
+
+# Matches one "start-end" byte-range spec; both halves optional
+_RANGE_SPEC_RE = re.compile(r'(\d*)-(\d*)')
+
+# Fast path for the overwhelmingly common single-range header: one compiled
+# match against the full header instead of split + per-spec parsing
+_RANGE_ONE_RE = re.compile(r'bytes=(\d+)-(\d*)$')
+
+def _parse_byte_ranges(header, file_size):
+    """Parse a Range header into sorted, merged (start, end) pairs.
+
+    Overlapping and adjacent ranges are coalesced; an empty result means the
+    header was unsatisfiable for this file.
+    """
+    if not header or not header.startswith('bytes='):
+        return []
+    m = _RANGE_ONE_RE.match(header)
+    if m:
+        start = int(m.group(1))
+        end = int(m.group(2)) if m.group(2) else file_size - 1
+        if start <= end and start < file_size:
+            return [(start, min(end, file_size - 1))]
+        return []
+    ranges = []
+    for spec in header[6:].split(','):
+        m = _RANGE_SPEC_RE.fullmatch(spec.strip())
+        if not m:
+            continue
+        start_s, end_s = m.groups()
+        if start_s:
+            start = int(start_s)
+            end = int(end_s) if end_s else file_size - 1
+        elif end_s:
+            # Suffix range: last N bytes
+            start = max(file_size - int(end_s), 0)
+            end = file_size - 1
+        else:
+            continue
+        if start <= end and start < file_size:
+            ranges.append((start, min(end, file_size - 1)))
+    ranges.sort()
+    merged = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def _multi_range_response(file_path, file_size, content_type, range_header):
+    """Serve a multipart/byteranges 206 for multi-range requests.
+
+    werkzeug's conditional send_file only honours single ranges, so requests
+    like 'bytes=0-1023,5000-6023' (MP4/MP3 index probes fetching several
+    slices in one round trip) would otherwise fall back to a full 200 body.
+    """
+    ranges = _parse_byte_ranges(range_header, file_size)
+    if not ranges:
+        response = Response(status=416)
+        response.headers['Content-Range'] = f'bytes */{file_size}'
+        return response
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        response = Response(partial_file_sender(file_path, start, end),
+                            status=206, mimetype=content_type)
+        response.headers['Content-Range'] = f'bytes {start}-{end}/{file_size}'
+        response.headers['Content-Length'] = str(end - start + 1)
+        response.headers['Accept-Ranges'] = 'bytes'
+        return response
+
+    boundary = uuid.uuid4().hex
+
+    def generate():
+        for start, end in ranges:
+            yield (f'\r\n--{boundary}\r\n'
+                   f'Content-Type: {content_type}\r\n'
+                   f'Content-Range: bytes {start}-{end}/{file_size}\r\n\r\n').encode()
+            yield from partial_file_sender(file_path, start, end)
+        yield f'\r\n--{boundary}--\r\n'.encode()
+
+    response = Response(generate(), status=206,
+                        mimetype=f'multipart/byteranges; boundary={boundary}')
+    response.headers['Accept-Ranges'] = 'bytes'
+    return response
+
+def _make_row_serializer(fields):
+    """Build a serializer specialized to one fixed key set.
+
+    The key fragments are encoded once at module load; per row only the
+    values pass through the JSON encoder, skipping generic dict traversal
+    for these fixed response schemas.
+    """
+    prefixes = [(b'{"' if i == 0 else b',"') + field.encode() + b'":'
+                for i, field in enumerate(fields)]
+
+    def serialize(row):
+        out = bytearray()
+        for prefix, field in zip(prefixes, fields):
+            out += prefix
+            out += _json_bytes(row.get(field))
+        out += b'}'
+        return bytes(out)
+
+    return serialize
+
+# Serializers for the two fixed playlist response shapes
+_PLAYLIST_ROW = _make_row_serializer(('id', 'name', 'description', 'created_date', 'track_count'))
+_PLAYLIST_TRACK_ROW = _make_row_serializer(('id', 'title', 'artist', 'album'))
+
+def _stream_json_list(items, serialize):
+    """Yield a JSON array item by item instead of materializing the body.
+
+    Keeps peak memory at one serialized row and starts the response as soon
+    as the first row is ready.
+    """
+    yield b'['
+    first = True
+    for item in items:
+        if not first:
+            yield b','
+        first = False
+        yield serialize(item)
+    yield b']'
+
+# Units for humanized file sizes, shared by the constant-time formatter below
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB')
+
+# Content types served by /play, built once instead of per request
+_CONTENT_TYPES = {
+    '.mp3': 'audio/mpeg',
+    '.m4a': 'audio/mp4',
+    '.wav': 'audio/wav',
+    '.mp4': 'video/mp4',
+    '.webm': 'video/webm'
+}
+
+def cached_stat(path):
+    """Return (exists, size, mtime) for a path, cached for a few seconds."""
+    result = _stat_cache.get(path)
+    if result is None:
+        try:
+            st = os.stat(path)
+            result = (True, st.st_size, st.st_mtime)
+        except OSError:
+            result = (False, 0, 0)
+        _stat_cache[path] = result
+    return result
+
+@app.teardown_appcontext
+def _remove_db_session(exception=None):
+    """Return the thread-local SQLAlchemy session to the scoped registry.
+
+    db_session() leaves the session open so repeated DB calls in
+    one request reuse it; this hook is where it finally gets disposed.
+    """
+    DbSession.remove()
+
 # Initialize Flask-Login
 login_manager = LoginManager()
 login_manager.init_app(app)
@@ -212,10 +596,14 @@ def download():
     if download_format not in ['audio', 'video']:
         return jsonify({'error': 'Invalid download format'}), 400
 
-    def download_thread(spotify_url):
+    # Resolve the user while the request context is still live; the background
+    # task must not touch current_user
+    user_id = current_user.id if current_user.is_authenticated else 'anonymous'
+
+    def download_thread(spotify_url, user_id):
         try:
             # Start download message
-            socketio.emit('status_message', {
+            BATCHER.push('status_message', {
                 'message': 'Starting download...',
                 'type': 'info'
             })
@@ -226,42 +614,42 @@ def download():
                     app.logger.error('No Spotify URL provided.')
                     return
                 app.logger.info(f"Extracting track ID from URL: {spotify_url}")
-                
-                # Clean up the URL in case it contains log messages
-                if 'https://' in spotify_url:
-                    spotify_url = 'https://' + spotify_url.split('https://')[-1].split()[0]
-                
+
                 playlist_name = None
                 playlist_thumbnail = None
                 album_name = None
                 album_thumbnail = None
+                track_id = None
+
+                # One regex pass replaces the split() chains and also copes
+                # with URLs embedded in surrounding text
+                match = _SPOTIFY_URL_RE.search(spotify_url)
+                if not match:
+                    app.logger.error(f"Unrecognized Spotify URL: {spotify_url}")
+                    return
+                url_kind, spotify_id, playlist_track_id = match.groups()
 
                 # Handle album URLs
-                if 'album' in spotify_url:
-                    album_id = spotify_url.split('album/')[1].split('?')[0]
-                    album_info = sp.album(album_id)
+                if url_kind == 'album':
+                    album_info = sp.album(spotify_id)
                     album_name = album_info['name']
                     album_thumbnail = album_info['images'][0]['url'] if album_info['images'] else None
                     app.logger.info(f"Album info - Name: {album_name}, Thumbnail: {album_thumbnail}")
-                    tracks = fetch_all_album_tracks(album_id)
+                    tracks = fetch_all_album_tracks(spotify_id)
                     emit_message(f"Starting {download_format} download of album: {album_name}", "info")
                 # Handle playlist URLs
-                elif 'playlist' in spotify_url:
-                    playlist_id = spotify_url.split('playlist/')[1].split('?')[0]
-                    playlist = sp.playlist(playlist_id)
+                elif url_kind == 'playlist':
+                    playlist = sp.playlist(spotify_id)
                     playlist_name = playlist['name']
                     if playlist['images']:
                         playlist_thumbnail = playlist['images'][0]['url']
                     app.logger.info(f"Playlist info - Name: {playlist_name}, Thumbnail: {playlist_thumbnail}")
-                    # Get the track ID from the playlist URL if present
-                    if '?track=' in spotify_url:
-                        track_id = spotify_url.split('track=')[1].split('&')[0]
-                    else:
-                        track_id = None
+                    # Track ID from the playlist URL, if present
+                    track_id = playlist_track_id
                 # Handle track URLs
                 else:
-                    track_id = spotify_url.split('track/')[1].split('?')[0]
-                
+                    track_id = spotify_id
+
                 app.logger.info(f"Track ID: {track_id}")
                 
                 if track_id:
@@ -272,23 +660,22 @@ def download():
                     track_name = track['name']
                     artist_name = track['artists'][0]['name']
                     
-                    # Debug track data
-                    app.logger.info(f"Track data: {json.dumps(track, indent=2)}")
-                    
+                    # Debug track data (lazy %s formatting so the payload is
+                    # only rendered when DEBUG is actually emitted)
+                    app.logger.debug("Track data: %s", track)
+
                     # Get album images
                     album_images = track.get('album', {}).get('images', [])
-                    app.logger.info(f"Album images: {json.dumps(album_images, indent=2)}")
+                    app.logger.debug("Album images: %s", album_images)
                     
-                    # Get the highest quality thumbnail
+                    # Get the highest quality thumbnail. max() is a single
+                    # O(n) pass; no need to sort the whole list for one pick.
                     thumbnail_url = None
                     if album_images:
-                        # Sort images by size and get the largest one
-                        images = sorted(album_images, key=lambda x: x.get('width', 0) * x.get('height', 0), reverse=True)
-                        if images:
-                            thumbnail_url = images[0]['url']
-                            app.logger.info(f"Selected thumbnail URL: {thumbnail_url}")
-                        else:
-                            app.logger.warning("No valid images found in sorted list")
+                        largest = max(album_images,
+                                      key=lambda x: (x.get('width') or 0) * (x.get('height') or 0))
+                        thumbnail_url = largest.get('url')
+                        app.logger.info(f"Selected thumbnail URL: {thumbnail_url}")
                     else:
                         app.logger.warning("No album images found in track data")
                     
@@ -345,27 +732,19 @@ def download():
                             'album_thumbnail': album_thumbnail
                         }
                         
-                        app.logger.info(f"Download data: {json.dumps(download_data, indent=2)}")
-
-                        # Save to Firebase if configured
-                        try:
-                            if 'db' in globals() and db is not None:
-                                user_id = 'anonymous'  # Default user ID
-                                if 'current_user' in globals() and current_user is not None and hasattr(current_user, 'is_authenticated') and current_user.is_authenticated:
-                                    user_id = current_user.id
-                                
-                                db.collection('downloads').add({
-                                    **download_data,
-                                    'user_id': user_id
-                                })
-                                app.logger.info("Successfully saved to Firebase")
-                        except Exception as e:
-                            app.logger.error(f"Firebase error: {e}")
+                        app.logger.debug("Download data: %s", download_data)
+
+                        # Queue the record for the background Firebase writer
+                        _download_write_q.put({
+                            **download_data,
+                            'user_id': user_id
+                        })
+                        app.logger.info("Queued download record for Firebase")
                             # Continue even if Firebase fails
 
                         # Emit success events
                         socketio.emit('download_complete', download_data)
-                        socketio.emit('status_message', {
+                        BATCHER.push('status_message', {
                             'message': 'Download completed successfully!',
                             'type': 'success'
                         })
@@ -375,49 +754,64 @@ def download():
 
                 except Exception as e:
                     app.logger.error(f"Error processing download: {e}")
-                    socketio.emit('status_message', {
+                    BATCHER.push('status_message', {
                         'message': 'Download completed but failed to process metadata',
                         'type': 'warning'
                     })
             else:
-                socketio.emit('status_message', {
+                BATCHER.push('status_message', {
                     'message': 'Download failed',
                     'type': 'error'
                 })
 
         except Exception as e:
             app.logger.error(f"Download thread error: {e}")
-            socketio.emit('status_message', {
+            BATCHER.push('status_message', {
                 'message': f'Download failed: {str(e)}',
                 'type': 'error'
             })
 
-    # Start download thread
-    thread = threading.Thread(target=download_thread, args=(spotify_url,))
-    thread.daemon = True
-    thread.start()
-    
+    # Run the download as a SocketIO background task so status emits share the
+    # eventlet hub, deduping in-flight requests for the same URL. The
+    # semaphore keeps total concurrency at DOWNLOAD_WORKERS regardless of
+    # how many distinct URLs are POSTed.
+    if spotify_url in _active_downloads:
+        return jsonify({'message': 'Download already in progress'}), 202
+
+    _active_downloads.add(spotify_url)
+
+    def run_download():
+        try:
+            with _download_slots:
+                download_thread(spotify_url, user_id)
+        finally:
+            _active_downloads.discard(spotify_url)
+
+    socketio.start_background_task(run_download)
+
     return jsonify({'message': 'Download started'}), 200
 
 @app.route('/download-history', methods=['GET'])
 @login_required
 def get_download_history():
     try:
-        # Get user's downloads from Firebase
-        downloads = db.collection('downloads')\
+        # Get user's downloads from Firebase, projecting only the fields the
+        # response actually uses to cut transfer and decode cost. The gRPC
+        # read happens while the stream is iterated, so it is consumed in a
+        # tpool thread rather than on the hub.
+        query = db.collection('downloads')\
             .where('user_id', '==', current_user.id)\
             .order_by('timestamp', direction='DESCENDING')\
-            .limit(20)\
-            .stream()
-            
-        history = []
-        for doc in downloads:
-            data = doc.to_dict()
-            # Convert timestamp to string if it's a datetime
-            if isinstance(data.get('timestamp'), datetime):
-                data['timestamp'] = data['timestamp'].isoformat()
-            history.append(data)
-            
+            .select(['title', 'artist', 'format', 'timestamp', 'thumbnail', 'file_path'])\
+            .limit(20)
+        downloads = tpool.execute(list, query.stream())
+
+        history = [
+            {**data, 'timestamp': data['timestamp'].isoformat()}
+            if isinstance(data.get('timestamp'), datetime) else data
+            for data in (doc.to_dict() for doc in downloads)
+        ]
+
         return jsonify({'history': history}), 200
     except Exception as e:
         app.logger.error(f"Error fetching download history: {str(e)}")
@@ -427,16 +821,25 @@ def get_download_history():
 @login_required
 def clear_history():
     try:
-        # Delete user's downloads from Firebase
-        batch = db.batch()
-        docs = db.collection('downloads')\
-            .where('user_id', '==', current_user.id)\
-            .stream()
-            
-        for doc in docs:
-            batch.delete(doc.reference)
-            
-        batch.commit()
+        # Delete user's downloads from Firebase. select([]) fetches only the
+        # document references, and the deletes are chunked to stay under
+        # Firestore's 500-op batch limit, with chunks committed in parallel.
+        # Both the reference read and each commit are gRPC calls that would
+        # otherwise block the hub, so they run via tpool.
+        docs = tpool.execute(list, db.collection('downloads')
+                             .where('user_id', '==', current_user.id)
+                             .select([])
+                             .stream())
+
+        def commit_chunk(chunk):
+            batch = db.batch()
+            for doc in chunk:
+                batch.delete(doc.reference)
+            tpool.execute(batch.commit)
+
+        chunks = [docs[i:i + 450] for i in range(0, len(docs), 450)]
+        list(_COMMIT_POOL.map(commit_chunk, chunks))
+
         return jsonify({'success': True}), 200
     except Exception as e:
         app.logger.error(f"Error clearing history: {str(e)}")
@@ -473,64 +876,42 @@ def play_media(file_path):
     try:
         # Decode the URL-encoded file path
         file_path = urllib.parse.unquote(file_path)
-        
-        # Convert forward slashes to backslashes for Windows
-        file_path = file_path.replace('/', '\\')
-        
-        if not os.path.isfile(file_path):
+
+        # Normalize separators for the current platform
+        file_path = os.path.normpath(file_path)
+
+        exists, file_size, file_mtime = cached_stat(file_path)
+        if not exists:
             logger.error(f"File not found: {file_path}")
             return "File not found", 404
 
         # Determine content type based on file extension
         file_ext = os.path.splitext(file_path)[1].lower()
-        content_type = {
-            '.mp3': 'audio/mpeg',
-            '.m4a': 'audio/mp4',
-            '.wav': 'audio/wav',
-            '.mp4': 'video/mp4',
-            '.webm': 'video/webm'
-        }.get(file_ext, 'application/octet-stream')
-
-        # Get file size for range requests
-        file_size = os.path.getsize(file_path)
-        
-        # Handle range requests for proper streaming
-        range_header = request.headers.get('Range', None)
-        if range_header:
-            byte1, byte2 = 0, None
-            match = re.search(r'(\d+)-(\d*)', range_header)  
-            groups = match.groups()
-
-            if groups[0]:
-                byte1 = int(groups[0])
-            if groups[1]:
-                byte2 = int(groups[1])
-
-            if byte2 is None:
-                byte2 = file_size - 1
-            
-            length = byte2 - byte1 + 1
-            
-            resp = Response(
-                partial_file_sender(file_path, byte1, byte2),
-                status=206,
-                mimetype=content_type,
-                direct_passthrough=True
-            )
-            
-            resp.headers.add('Content-Range', f'bytes {byte1}-{byte2}/{file_size}')
-            resp.headers.add('Accept-Ranges', 'bytes')
-            resp.headers.add('Content-Length', str(length))
-        else:
-            resp = Response(
-                partial_file_sender(file_path, 0, file_size - 1),
-                status=200,
-                mimetype=content_type,
-                direct_passthrough=True
-            )
-            resp.headers.add('Content-Length', str(file_size))
-
-        return resp
+        content_type = _CONTENT_TYPES.get(file_ext, 'application/octet-stream')
+
+        # Multi-range requests need multipart/byteranges framing, which
+        # werkzeug doesn't produce. Honour revalidation there too: a matching
+        # If-None-Match costs zero body bytes.
+        range_header = request.headers.get('Range')
+        if range_header and ',' in range_header:
+            etag = f'{int(file_size):x}-{int(file_mtime):x}'
+            if request.if_none_match.contains_weak(etag):
+                return '', 304, {'ETag': f'W/"{etag}"'}
+            response = _multi_range_response(file_path, file_size, content_type, range_header)
+            response.set_etag(etag, weak=True)
+            response.last_modified = file_mtime
+            return response
+
+        # Let Flask/werkzeug handle Range and conditional requests; this uses
+        # the WSGI server's file wrapper (sendfile) instead of a Python
+        # byte-copy loop, so streamed bytes never pass through the interpreter
+        return send_file(
+            file_path,
+            mimetype=content_type,
+            conditional=True,
+            etag=True,
+            last_modified=file_mtime
+        )
 
     except Exception as e:
         logger.error(f"Error streaming file {file_path}: {str(e)}")
@@ -554,24 +935,15 @@ def get_subtitles(file_path):
         ]
         
         # Find the first existing subtitle file
-        srt_path = next((path for path in srt_paths if os.path.isfile(path)), None)
+        srt_path = next((path for path in srt_paths if cached_stat(path)[0]), None)
         
         if not srt_path:
             return "No subtitles found", 404
 
-        # Convert SRT to WebVTT format (required for HTML5 video)
-        def srt_to_vtt(srt_content):
-            # Add WebVTT header
-            vtt = "WEBVTT\n\n"
-            
-            # Convert SRT timestamps to WebVTT format (same format, just different header)
-            vtt += srt_content.replace(',', '.')
-            
-            return vtt
-
-        with open(srt_path, 'r', encoding='utf-8') as f:
-            srt_content = f.read()
-            vtt_content = srt_to_vtt(srt_content)
+        # Convert SRT to WebVTT format (required for HTML5 video). The
+        # conversion is memoized keyed by file size/mtime, so repeat plays of
+        # the same track skip the disk read entirely.
+        vtt_content = _vtt_for(srt_path, *cached_stat(srt_path)[1:])
 
         response = Response(vtt_content, mimetype='text/vtt')
         response.headers['Content-Type'] = 'text/vtt'
@@ -602,13 +974,13 @@ def get_lyrics(file_path):
         for fmt in subtitle_formats:
             temp_path = base_path + fmt
             logging.info(f"Checking for subtitle file: {temp_path}")
-            if os.path.exists(temp_path):
+            if cached_stat(temp_path)[0]:
                 subtitle_path = temp_path
                 logging.info(f"Found subtitle file: {subtitle_path}")
                 break
         
         if subtitle_path:
-            lyrics = parse_subtitle_file(subtitle_path)
+            lyrics = _lyrics_for(subtitle_path, *cached_stat(subtitle_path)[1:])
             if lyrics:
                 logging.info(f"Successfully parsed lyrics: {len(lyrics)} lines")
                 return jsonify({'success': True, 'lyrics': lyrics})
@@ -626,18 +998,15 @@ def get_lyrics(file_path):
 def track_api(track_id):
     """API endpoint for managing individual tracks"""
     try:
-        # Get Firebase instance
-        from firebase_service import FirebaseService
-        firebase = FirebaseService.get_instance()
+        firebase = _firebase
         
         if request.method == 'GET':
-            # Get all tracks and find the one with matching ID
-            tracks = firebase.get_all_tracks()
-            track = next((t for t in tracks if t.get('id') == track_id), None)
-            
+            # Direct indexed lookup instead of scanning the whole collection
+            track = _get_track_for_request(firebase, track_id)
+
             if not track:
                 return jsonify({'error': 'Track not found'}), 404
-                
+
             return jsonify({
                 'id': track.get('id'),
                 'title': track.get('title'),
@@ -648,7 +1017,7 @@ def track_api(track_id):
 
         elif request.method == 'PUT':
             data = request.get_json()
-            success = firebase.update_track(track_id, {
+            success = tpool.execute(firebase.update_track, track_id, {
                 'title': data.get('title'),
                 'artist': data.get('artist'),
                 'album': data.get('album')
@@ -661,28 +1030,18 @@ def track_api(track_id):
 
         elif request.method == 'DELETE':
             # Get track info first
-            tracks = firebase.get_all_tracks()
-            track = next((t for t in tracks if t.get('id') == track_id), None)
-            
+            track = _get_track_for_request(firebase, track_id)
+
             if not track:
                 return jsonify({'error': 'Track not found'}), 404
                 
-            # Delete the actual file if it exists
+            # Delete the actual file and any subtitles
             file_path = track.get('file_path')
-            if file_path and os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                    # Also try to remove subtitle files if they exist
-                    base_path = os.path.splitext(file_path)[0]
-                    for ext in ['.srt', '.en.srt', '.vtt', '.en.vtt']:
-                        sub_path = base_path + ext
-                        if os.path.exists(sub_path):
-                            os.remove(sub_path)
-                except Exception as e:
-                    logger.error(f"Error deleting files: {e}")
-            
+            if file_path:
+                _remove_track_files(file_path)
+
             # Delete from Firebase
-            success = firebase.delete_track(track_id)
+            success = tpool.execute(firebase.delete_track, track_id)
             if success:
                 return jsonify({'success': True})
             else:
@@ -696,11 +1055,7 @@ def track_api(track_id):
 def get_playlists():
     """API endpoint to get all playlists"""
     try:
-        # Get Firebase instance
-        from firebase_service import FirebaseService
-        firebase = FirebaseService.get_instance()
-        
-        playlists = firebase.get_all_playlists()
+        playlists = _all_playlists()
         return jsonify([{
             'id': p.get('id'),
             'name': p.get('name')
@@ -713,12 +1068,10 @@ def get_playlists():
 def manage_track(track_id):
     """Manage track metadata and deletion"""
     try:
-        # Get Firebase instance
-        from firebase_service import FirebaseService
-        firebase = FirebaseService.get_instance()
-        
-        track = firebase.get_track(track_id)
+        firebase = _firebase
         
+        track = _get_track_for_request(firebase, track_id)
+
         if not track:
             return jsonify({'error': 'Track not found'}), 404
         
@@ -732,7 +1085,7 @@ def manage_track(track_id):
             
         elif request.method == 'PUT':
             data = request.get_json()
-            success = firebase.update_track(track_id, {
+            success = tpool.execute(firebase.update_track, track_id, {
                 'title': data.get('title'),
                 'artist': data.get('artist'),
                 'album': data.get('album')
@@ -744,22 +1097,13 @@ def manage_track(track_id):
                 return jsonify({'error': 'Failed to update track'}), 500
                 
         elif request.method == 'DELETE':
-            # Delete the actual file if it exists
+            # Delete the actual file and any subtitles
             file_path = track.get('file_path')
-            if file_path and os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                    # Also try to remove subtitle files if they exist
-                    base_path = os.path.splitext(file_path)[0]
-                    for ext in ['.srt', '.en.srt', '.vtt', '.en.vtt']:
-                        sub_path = base_path + ext
-                        if os.path.exists(sub_path):
-                            os.remove(sub_path)
-                except Exception as e:
-                    logger.error(f"Error deleting files: {e}")
-            
+            if file_path:
+                _remove_track_files(file_path)
+
             # Delete from Firebase
-            success = firebase.delete_track(track_id)
+            success = tpool.execute(firebase.delete_track, track_id)
             if success:
                 return jsonify({'message': 'Track deleted successfully'})
             else:
@@ -773,25 +1117,23 @@ def manage_track(track_id):
 def manage_playlists():
     """Create and list playlists"""
     try:
-        # Get Firebase instance
-        from firebase_service import FirebaseService
-        firebase = FirebaseService.get_instance()
+        firebase = _firebase
         
         if request.method == 'GET':
-            playlists = firebase.get_all_playlists()
-            return jsonify([{
-                'id': p.get('id'),
-                'name': p.get('name'),
-                'description': p.get('description'),
-                'created_date': p.get('created_date')
-            } for p in playlists])
+            # One batched fetch with server-side counts instead of a read per
+            # playlist
+            playlists = tpool.execute(firebase.get_all_playlists_with_counts,
+                                      fields=['name', 'description', 'created_date'])
+            return Response(stream_with_context(_stream_json_list(playlists, _PLAYLIST_ROW)),
+                            mimetype='application/json')
             
         elif request.method == 'POST':
             data = request.get_json()
-            new_playlist = firebase.create_playlist({
+            new_playlist = tpool.execute(firebase.create_playlist, {
                 'name': data['name'],
                 'description': data.get('description', ''),
-                'created_date': datetime.now().isoformat()
+                # UTC so server-local time never leaks into stored records
+                'created_date': datetime.utcnow().isoformat(timespec='milliseconds') + 'Z'
             })
             return jsonify({
                 'id': new_playlist.get('id'),
@@ -807,40 +1149,43 @@ def manage_playlists():
 def manage_playlist_tracks(playlist_id):
     """Manage tracks in a playlist"""
     try:
-        # Get Firebase instance
-        from firebase_service import FirebaseService
-        firebase = FirebaseService.get_instance()
-        
-        playlist = firebase.get_playlist(playlist_id)
-        if not playlist:
-            return jsonify({'error': 'Playlist not found'}), 404
+        firebase = _firebase
         
         if request.method == 'GET':
-            tracks = firebase.get_playlist_tracks(playlist_id)
-            return jsonify([{
-                'id': t.get('id'),
-                'title': t.get('title'),
-                'artist': t.get('artist'),
-                'album': t.get('album')
-            } for t in tracks])
-            
-        elif request.method == 'POST':
+            # One fused fetch covers both the existence check and the payload
+            playlist = tpool.execute(firebase.get_playlist_with_tracks,
+                                     playlist_id, ['title', 'artist', 'album'])
+            if not playlist:
+                return jsonify({'error': 'Playlist not found'}), 404
+            return Response(stream_with_context(_stream_json_list(playlist['tracks'], _PLAYLIST_TRACK_ROW)),
+                            mimetype='application/json')
+
+        # POST/DELETE only need existence, which the TTL cache answers
+        # without a round trip for warm playlists; the miss path is a gRPC
+        # doc-get, so it goes through tpool like the other reads
+        if not tpool.execute(firebase.get_playlist_cached, playlist_id):
+            return jsonify({'error': 'Playlist not found'}), 404
+
+        if request.method == 'POST':
             data = request.get_json()
-            track_id = data.get('track_id')
-            if not track_id:
+            # Accept a single track_id or a track_ids list; both go through
+            # the batched path (one existence probe + one batch write)
+            track_ids = data.get('track_ids') or ([data['track_id']] if data.get('track_id') else None)
+            if not track_ids:
                 return jsonify({'error': 'Track ID required'}), 400
-                
-            # Check if track exists
-            track = firebase.get_track(track_id)
-            if not track:
-                return jsonify({'error': 'Track not found'}), 404
-                
-            # Add track to playlist
-            success = firebase.add_track_to_playlist(playlist_id, track_id)
-            if success:
-                return jsonify({'message': 'Track added to playlist'})
+
+            if len(track_ids) == 1:
+                # Single adds ride the aggregator; concurrent drag-and-drop
+                # POSTs for the same playlist share one batched commit
+                future = Future()
+                _playlist_add_q.put((playlist_id, track_ids[0], future))
+                results = {track_ids[0]: future.result()}
             else:
-                return jsonify({'error': 'Failed to add track to playlist'}), 500
+                results = tpool.execute(firebase.add_tracks_to_playlist,
+                                        playlist_id, track_ids)
+            if not any(results.values()):
+                return jsonify({'error': 'Track not found', 'results': results}), 404
+            return jsonify({'message': 'Track(s) added to playlist', 'results': results})
                 
         elif request.method == 'DELETE':
             data = request.get_json()
@@ -849,7 +1194,8 @@ def manage_playlist_tracks(playlist_id):
                 return jsonify({'error': 'Track ID required'}), 400
                 
             # Remove track from playlist
-            success = firebase.remove_track_from_playlist(playlist_id, track_id)
+            success = tpool.execute(firebase.remove_track_from_playlist,
+                                    playlist_id, track_id)
             if success:
                 return jsonify({'message': 'Track removed from playlist'})
             else:
@@ -859,66 +1205,103 @@ def manage_playlist_tracks(playlist_id):
         logger.error(f"Error managing playlist tracks: {e}")
         return jsonify({'error': str(e)}), 500
 
-def partial_file_sender(file_path, start=0, end=None, chunk_size=8192):
-    """Generator to stream file in chunks with support for range requests."""
+def partial_file_sender(file_path, start=0, end=None, chunk_size=1 << 20):
+    """Generator to stream file in chunks with support for range requests.
+
+    Full-file playback goes through send_file (kernel sendfile via the WSGI
+    file wrapper); this generator is only for partial deliveries. The 1MB
+    reads keep the Python-level loop to roughly one iteration per MB served,
+    and chunk_size itself is never mutated (the old min() aliasing pinned all
+    later reads to the size of the first short one).
+    """
     try:
-        with open(file_path, 'rb') as f:
+        # buffering=0 skips the BufferedReader layer: each 1MB read goes
+        # straight from the kernel into the bytes object we yield, with no
+        # intermediate user-space buffer copy
+        with open(file_path, 'rb', buffering=0) as f:
             f.seek(start)
-            remaining = end - start + 1
-            while remaining:
-                chunk_size = min(chunk_size, remaining)
-                data = f.read(chunk_size)
+            length = end - start + 1
+            sent = 0
+            while sent < length:
+                data = f.read(min(chunk_size, length - sent))
                 if not data:
                     break
-                remaining -= len(data)
+                sent += len(data)
                 yield data
     except Exception as e:
         logger.error(f"Error in partial_file_sender for {file_path}: {str(e)}")
         yield b''
 
+def _list_dir_names(directory):
+    """Return (directory, set of entry names), empty on any OS error."""
+    try:
+        return directory, {entry.name for entry in os.scandir(directory)}
+    except OSError:
+        return directory, set()
+
+def _annotate_track(track, listings):
+    """Attach file_type, subtitle, size and existence info to one track."""
+    file_path = track.get('file_path', '')
+    file_ext = os.path.splitext(file_path)[1].lower()
+    track['file_type'] = 'video' if file_ext == '.mp4' else 'audio'
+
+    present = listings.get(os.path.dirname(file_path), set())
+    base_name = os.path.splitext(os.path.basename(file_path))[0]
+
+    # Check for subtitle file
+    if track['file_type'] == 'video':
+        track['has_subtitles'] = (base_name + '.srt' in present
+                                  or base_name + '.en.srt' in present)
+    else:
+        track['has_subtitles'] = False
+
+    # Format file size: the unit index is just the byte count's
+    # bit length / 10, so no division loop or list allocation needed
+    size = track.get('file_size')
+    if size:
+        idx = min(3, max(0, (int(size).bit_length() - 1) // 10))
+        track['formatted_size'] = f"{size / (1 << (10 * idx)):.1f} {_SIZE_UNITS[idx]}"
+    else:
+        track['formatted_size'] = "Unknown"
+
+    track['formatted_duration'] = format_duration(track.get('duration', 0))
+    track['file_exists'] = os.path.basename(file_path) in present
+    return track
+
+# Last processed get_user_tracks result, keyed by the track snapshot and the
+# media directories' mtimes; steady-state calls skip the filesystem pass
+_user_tracks_cache = {'key': None, 'result': None}
+
 def get_user_tracks():
     """
     Retrieve tracks associated with the current user.
     """
     try:
-        # Import Firebase service if not already imported
-        from firebase_service import FirebaseService
-        firebase = FirebaseService.get_instance()
-        
-        # Fetch tracks from Firebase
-        tracks = firebase.get_all_tracks()
-        
-        # Process tracks to add additional information
-        for track in tracks:
-            file_path = track.get('file_path', '')
-            file_ext = os.path.splitext(file_path)[1].lower()
-            track['file_type'] = 'video' if file_ext == '.mp4' else 'audio'
-            
-            # Check for subtitle file
-            if track['file_type'] == 'video':
-                base_path = os.path.splitext(file_path)[0]
-                srt_paths = [
-                    base_path + '.srt',
-                    base_path + '.en.srt'
-                ]
-                track['has_subtitles'] = any(os.path.exists(path) for path in srt_paths)
-            else:
-                track['has_subtitles'] = False
-            
-            # Format file size
-            if track.get('file_size'):
-                size = track['file_size']
-                for unit in ['B', 'KB', 'MB', 'GB']:
-                    if size < 1024:
-                        track['formatted_size'] = f"{size:.1f} {unit}"
-                        break
-                    size /= 1024
-            else:
-                track['formatted_size'] = "Unknown"
-            
-            track['formatted_duration'] = format_duration(track.get('duration', 0))
-            track['file_exists'] = os.path.exists(file_path)
-        
+        # Fetch tracks from Firebase (memoized for the current request)
+        tracks = _all_tracks()
+
+        directories = {os.path.dirname(t.get('file_path', '')) for t in tracks}
+        directories.discard('')
+
+        # Short-circuit when neither the track snapshot nor the directories
+        # changed; directory mtimes move whenever files appear or vanish
+        key = (
+            tuple((t.get('id'), t.get('file_path'), t.get('file_size')) for t in tracks),
+            tuple(sorted((d, cached_stat(d)[2]) for d in directories))
+        )
+        if key == _user_tracks_cache['key']:
+            return _user_tracks_cache['result']
+
+        # One scandir per unique directory replaces the 3 stat() calls per
+        # track (file + two subtitle probes); the directory listings are
+        # fetched in parallel so slow or network-mounted dirs overlap
+        listings = dict(_ANNOTATE_POOL.map(_list_dir_names, directories))
+
+        # Annotation is then stat-free; fan it out across the pool too
+        list(_ANNOTATE_POOL.map(lambda t: _annotate_track(t, listings), tracks))
+
+        _user_tracks_cache['key'] = key
+        _user_tracks_cache['result'] = tracks
         return tracks
     except Exception as e:
         app.logger.error(f"Error retrieving tracks: {e}")
@@ -964,4 +1347,11 @@ if __name__ == '__main__':
         logger.error(f"Error initializing database: {e}")
         raise
 
-    socketio.run(app, debug=True)
+    # The Werkzeug dev server (debug + reloader) is single-process and tops
+    # out around a hundred requests per second; only run it when explicitly
+    # asked. Production runs through gunicorn eventlet workers instead:
+    #   gunicorn -k eventlet -w 4 --worker-connections 1000 src.app:app
+    if os.environ.get('KO3_DEV'):
+        socketio.run(app, debug=True)
+    else:
+        socketio.run(app, host='0.0.0.0', port=int(os.environ.get('PORT', '5000')))
@@ -1,30 +1,47 @@
 import os
 import sys
+import atexit
+import contextlib
 import logging
+import logging.handlers
+import queue
+import threading
+import time
+from concurrent.futures import Future
 from datetime import datetime
 from typing import Optional, List, Union, Dict, Any
 from sqlalchemy import (
-    create_engine, Column, Integer, String, DateTime, 
-    Boolean, Text, func, ForeignKey, UniqueConstraint, inspect
+    create_engine, Column, Integer, String, DateTime,
+    Boolean, Text, func, ForeignKey, UniqueConstraint, inspect, event, text,
+    update, insert
 )
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session, scoped_session, relationship
+from sqlalchemy.orm import sessionmaker, Session, scoped_session, relationship, load_only
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from cachetools import TTLCache
 
 # Ensure logs directory exists
 LOGS_DIR = os.path.join(os.path.dirname(__file__), '..', 'logs')
 os.makedirs(LOGS_DIR, exist_ok=True)
 
-# Configure logging
+# Configure logging. Records go through a QueueHandler so the file and
+# stdout writes happen on the listener's thread, off the download path.
 LOG_FILE = os.path.join(LOGS_DIR, 'database.log')
+_log_queue = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(
+    _log_queue,
+    logging.FileHandler(LOG_FILE),
+    logging.StreamHandler(sys.stdout),
+    respect_handler_level=True
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler(sys.stdout)
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
@@ -37,34 +54,111 @@ DATABASE_PATH = os.path.join(DATABASE_DIR, 'spotify_downloads.db')
 
 # SQLAlchemy setup
 Base = declarative_base()
+# QueuePool instead of StaticPool: with WAL enabled, readers on their own
+# connections proceed while a writer holds the write lock, so
+# get_track_by_id/search_tracks stop serializing behind add_track commits.
+# LIFO checkout keeps hot connections (and their page caches) in rotation.
+# The poolclass must be explicit — on SQLAlchemy 1.4 file-based SQLite
+# defaults to NullPool, which rejects the sizing arguments outright.
 engine = create_engine(
-    f'sqlite:///{DATABASE_PATH}', 
-    echo=False, 
-    connect_args={'check_same_thread': False},
-    poolclass=StaticPool
+    f'sqlite:///{DATABASE_PATH}',
+    echo=False,
+    connect_args={'check_same_thread': False, 'timeout': 30},
+    poolclass=QueuePool,
+    pool_size=5,
+    max_overflow=10,
+    pool_pre_ping=True,
+    pool_use_lifo=True,
+    pool_recycle=3600,
+    # 2.0-style engine with a generous compiled-statement cache so repeated
+    # ORM statements skip SQL compilation
+    future=True,
+    query_cache_size=1200
 )
+
+@event.listens_for(engine, 'connect')
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each new SQLite connection for concurrent downloader traffic.
+
+    WAL lets readers run while a download commit is in flight, and
+    synchronous=NORMAL drops the per-commit fsync that WAL makes safe to
+    skip; the rest sizes the page cache, keeps temp tables in memory, maps
+    the file for reads, and waits out short write-lock contention.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
 session_factory = sessionmaker(bind=engine)
 Session = scoped_session(session_factory)
 
-class DatabaseContextManager:
-    """Context manager for database sessions."""
-    def __init__(self, session_factory=Session):
-        self.session = session_factory()
-
-    def __enter__(self):
-        return self.session
+# Read-only engine over the same file (sqlite URI mode=ro) for analytics:
+# statistics, search and the contents dump never take the write lock or
+# trigger checkpoints, so dashboard polls cannot stall download commits.
+# uri=true must live in the URL query — that is what switches the pysqlite
+# dialect onto its URI branch; as a connect_args entry the filename gets
+# abspathed into a literal "file:..." path that never opens.
+read_engine = create_engine(
+    f'sqlite:///file:{DATABASE_PATH}?mode=ro&uri=true',
+    echo=False,
+    connect_args={'check_same_thread': False, 'timeout': 30},
+    poolclass=QueuePool,
+    pool_size=5,
+    max_overflow=10,
+    pool_pre_ping=True,
+    pool_use_lifo=True,
+    pool_recycle=3600,
+    future=True,
+    query_cache_size=1200
+)
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        try:
-            if exc_type is None:
-                self.session.commit()
-            else:
-                self.session.rollback()
-                logger.error(f"Database transaction failed: {exc_val}")
-        except Exception as e:
-            logger.error(f"Error in database context manager: {e}")
-        finally:
-            self.session.close()
+@event.listens_for(read_engine, 'connect')
+def _set_readonly_pragmas(dbapi_connection, connection_record):
+    """Read-side tuning only — no journal-mode writes on a ro connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=1")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+ReadSession = scoped_session(sessionmaker(bind=read_engine))
+
+@contextlib.contextmanager
+def db_session():
+    """Context manager around the thread-local scoped session.
+
+    The scoped_session registry hands each thread one reusable Session, so
+    entering here is just a registry lookup. The session is left open on
+    exit for the thread's next operation — callers dispose of it with
+    Session.remove() at thread or request teardown. Generator-based so the
+    enter/exit machinery runs in C rather than three Python method calls.
+    """
+    session = Session()
+    try:
+        yield session
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Database transaction failed: {e}")
+        raise
+
+@contextlib.contextmanager
+def read_session():
+    """Session on the read-only engine for analytics queries.
+
+    Nothing to commit and nothing worth keeping open between calls, so the
+    session goes back to the scoped registry on exit.
+    """
+    try:
+        yield ReadSession()
+    finally:
+        ReadSession.remove()
 
 class DownloadedTrack(Base):
     """Model to track downloaded Spotify/YouTube tracks with enhanced metadata."""
@@ -75,8 +169,8 @@ class DownloadedTrack(Base):
     spotify_uri = Column(String, nullable=True)  
     youtube_id = Column(String)
     title = Column(String, nullable=False)
-    artist = Column(String, nullable=False)
-    album = Column(String)
+    artist = Column(String, nullable=False, index=True)
+    album = Column(String, index=True)
     duration = Column(Integer)  
     file_path = Column(String, nullable=False)
     file_size = Column(Integer)  
@@ -145,6 +239,51 @@ class DownloadHistory(Base):
     def __repr__(self):
         return f"<DownloadHistory total:{self.total_downloads}>"
 
+# The download pipeline looks the same track up several times in a row
+# (existence check, post-download verify, UI refresh); hits here skip the
+# whole SQLite round trip. Writes invalidate their ids in add_tracks_bulk.
+_TRACK_CACHE = TTLCache(maxsize=2048, ttl=60)
+_TRACK_CACHE_LOCK = threading.Lock()
+
+# SQLite allows one writer at a time, so downloader threads never write
+# directly: add_track enqueues here and a single daemon groups queued tracks
+# into one bulk transaction (group commit), waiting _COMMIT_DELAY for
+# siblings up to _COMMIT_SIBLINGS per flush. Callers still block on a Future
+# for their own row, but concurrent writers no longer contend for the lock.
+_write_q = queue.Queue()
+_COMMIT_DELAY = 0.005
+_COMMIT_SIBLINGS = 32
+
+def _flush_write_items(items):
+    specs = [spec for spec, _ in items]
+    try:
+        by_id = {row.track_id: row
+                 for row in DatabaseManager.add_tracks_bulk(specs)}
+    except Exception as e:
+        logger.error(f"Error flushing queued track writes: {e}")
+        by_id = {}
+    for spec, future in items:
+        future.set_result(by_id.get(spec['track_id']))
+
+def _writer_loop():
+    while True:
+        items = [_write_q.get()]
+        time.sleep(_COMMIT_DELAY)
+        while len(items) < _COMMIT_SIBLINGS and not _write_q.empty():
+            items.append(_write_q.get_nowait())
+        _flush_write_items(items)
+
+def _drain_write_q():
+    """Flush whatever is still queued when the process exits."""
+    items = []
+    while not _write_q.empty():
+        items.append(_write_q.get_nowait())
+    if items:
+        _flush_write_items(items)
+
+threading.Thread(target=_writer_loop, daemon=True).start()
+atexit.register(_drain_write_q)
+
 class DatabaseManager:
     """Comprehensive database management utility."""
     
@@ -194,6 +333,51 @@ class DatabaseManager:
                 # Log current statistics
                 logger.info(f"Current download history: {history}")
                 
+            # Full-text index over the searchable columns; triggers keep it in
+            # sync with the content table so search_tracks can use MATCH
+            # instead of three LIKE table scans. begin() so the DDL commits —
+            # on a future-style engine a plain connect() rolls back on close,
+            # which silently discarded the triggers.
+            with engine.begin() as conn:
+                fts_exists = conn.exec_driver_sql(
+                    "SELECT 1 FROM sqlite_master WHERE type='table' AND name='tracks_fts'"
+                ).fetchone() is not None
+                conn.exec_driver_sql(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS tracks_fts USING fts5("
+                    "title, artist, album, content='downloaded_tracks', content_rowid='id')"
+                )
+                if not fts_exists:
+                    # One-time backfill: the table starts empty and the
+                    # triggers only cover writes from here on, so rows
+                    # downloaded before the index existed must be pulled in
+                    # from the content table
+                    conn.exec_driver_sql(
+                        "INSERT INTO tracks_fts(tracks_fts) VALUES('rebuild')"
+                    )
+                conn.exec_driver_sql(
+                    "CREATE TRIGGER IF NOT EXISTS tracks_fts_ai AFTER INSERT ON downloaded_tracks BEGIN "
+                    "INSERT INTO tracks_fts(rowid, title, artist, album) "
+                    "VALUES (new.id, new.title, new.artist, new.album); END"
+                )
+                conn.exec_driver_sql(
+                    "CREATE TRIGGER IF NOT EXISTS tracks_fts_ad AFTER DELETE ON downloaded_tracks BEGIN "
+                    "INSERT INTO tracks_fts(tracks_fts, rowid, title, artist, album) "
+                    "VALUES ('delete', old.id, old.title, old.artist, old.album); END"
+                )
+                conn.exec_driver_sql(
+                    "CREATE TRIGGER IF NOT EXISTS tracks_fts_au AFTER UPDATE ON downloaded_tracks BEGIN "
+                    "INSERT INTO tracks_fts(tracks_fts, rowid, title, artist, album) "
+                    "VALUES ('delete', old.id, old.title, old.artist, old.album); "
+                    "INSERT INTO tracks_fts(rowid, title, artist, album) "
+                    "VALUES (new.id, new.title, new.artist, new.album); END"
+                )
+
+            # Fold accumulated WAL pages back into the main file and refresh
+            # the query planner's statistics while we're idle at startup
+            with engine.connect() as conn:
+                conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+                conn.exec_driver_sql("PRAGMA optimize")
+
             logger.info("Database initialization completed successfully")
             return True
             
@@ -208,49 +392,70 @@ class DatabaseManager:
 
     @classmethod
     def migrate_database(cls):
-        """Migrate the database to the latest schema."""
+        """Migrate the database to the latest schema.
+
+        Missing columns are added in place with ALTER TABLE ... ADD COLUMN —
+        a metadata-only change that keeps all existing rows and costs a page
+        write per column, instead of dropping and rebuilding every table. The
+        destructive drop/recreate path (preceded by a file backup) only runs
+        when the tracks table itself is absent or broken.
+        """
         try:
             logger.info("Starting database migration...")
-            
-            # Create backup of existing database
+
+            missing = cls.get_missing_columns()
+            if missing is not None and missing:
+                table = Base.metadata.tables['downloaded_tracks']
+                with engine.connect() as conn:
+                    for name in sorted(missing):
+                        col_type = table.columns[name].type.compile(engine.dialect)
+                        conn.exec_driver_sql(
+                            f"ALTER TABLE downloaded_tracks ADD COLUMN {name} {col_type}")
+                        logger.info(f"Added column {name} {col_type}")
+                    conn.commit()
+                # Pick up any tables that are new to the schema
+                Base.metadata.create_all(engine)
+                logger.info("Database migration completed successfully")
+                return True
+
+            # Table missing or unreadable: rebuild from scratch, keeping a
+            # backup of whatever file exists
             if os.path.exists(DATABASE_PATH):
                 backup_path = f"{DATABASE_PATH}.backup"
                 import shutil
                 shutil.copy2(DATABASE_PATH, backup_path)
                 logger.info(f"Created database backup at: {backup_path}")
-            
-            # Drop all tables and recreate with new schema
+
             Base.metadata.drop_all(engine)
             logger.info("Dropped existing tables")
-            
-            # Create new tables
+
             Base.metadata.create_all(engine)
             logger.info("Created new tables with updated schema")
-            
+
             # Initialize download history
             with Session() as session:
                 history = DownloadHistory()
                 session.add(history)
                 session.commit()
                 logger.info("Initialized new download history")
-            
+
             logger.info("Database migration completed successfully")
             return True
-            
+
         except Exception as e:
             logger.error(f"Error during database migration: {e}")
             logger.exception("Full traceback:")
             return False
 
     @classmethod
-    def needs_migration(cls):
-        """Check if database needs migration."""
+    def get_missing_columns(cls):
+        """Columns the tracks table lacks, or None if it needs a rebuild."""
         try:
-            inspector = inspect(engine)
             if not os.path.exists(DATABASE_PATH):
-                return True
-                
-            # Check for all expected columns in downloaded_tracks
+                return None
+            inspector = inspect(engine)
+            if 'downloaded_tracks' not in inspector.get_table_names():
+                return None
             columns = {c['name'] for c in inspector.get_columns('downloaded_tracks')}
             expected_columns = {
                 'id', 'track_id', 'spotify_uri', 'youtube_id', 'title', 'artist',
@@ -259,17 +464,21 @@ class DatabaseManager:
                 'audio_format', 'audio_quality', 'lyrics_file', 'subtitle_file',
                 'thumbnail_url', 'additional_metadata'
             }
-            
-            missing_columns = expected_columns - columns
-            if missing_columns:
-                logger.info(f"Database needs migration. Missing columns: {missing_columns}")
-                return True
-                
-            return False
-            
+            return expected_columns - columns
         except Exception as e:
             logger.error(f"Error checking migration status: {e}")
+            return None
+
+    @classmethod
+    def needs_migration(cls):
+        """Check if database needs migration."""
+        missing = cls.get_missing_columns()
+        if missing is None:
             return True
+        if missing:
+            logger.info(f"Database needs migration. Missing columns: {missing}")
+            return True
+        return False
 
     @staticmethod
     def add_track(
@@ -308,147 +517,251 @@ class DatabaseManager:
         :param has_subtitles: Whether subtitles are available
         :param additional_metadata: JSON string of additional track metadata
         """
-        logger.info(f"=== Adding track to database ===")
-        logger.info(f"Track ID: {track_id}")
-        logger.info(f"Title: {title}")
-        logger.info(f"Artist: {artist}")
-        logger.info(f"Album: {album}")
-        logger.info(f"File Path: {file_path}")
+        # Lazy %-style formatting: no string is built when INFO is filtered
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("=== Adding track to database ===")
+            logger.info("Track ID: %s", track_id)
+            logger.info("Title: %s", title)
+            logger.info("Artist: %s", artist)
+            logger.info("Album: %s", album)
+            logger.info("File Path: %s", file_path)
+
+        # Hand the write to the single-writer queue; the Future resolves to
+        # the inserted (or pre-existing) row once the group commit lands
+        future = Future()
+        _write_q.put(({
+            'track_id': track_id,
+            'title': title,
+            'artist': artist,
+            'album': album,
+            'file_path': file_path,
+            'is_video': is_video,
+            'spotify_uri': spotify_uri,
+            'youtube_id': youtube_id,
+            'duration': duration,
+            'file_size': file_size,
+            'audio_format': audio_format,
+            'audio_quality': audio_quality,
+            'thumbnail_url': thumbnail_url,
+            'download_source': download_source,
+            'has_subtitles': has_subtitles,
+            'additional_metadata': additional_metadata
+        }, future))
+        return future.result()
+
+    @classmethod
+    def add_tracks_bulk(cls, tracks: List[Dict[str, Any]]) -> List[DownloadedTrack]:
+        """
+        Add many tracks to the database in a single transaction.
+
+        Existing rows are found with chunked IN queries (500 ids per chunk,
+        under SQLite's bound-variable limit), new rows are inserted together,
+        and the download history gets one aggregated update — so an N-track
+        import costs one commit (and one fsync) instead of N.
 
+        :param tracks: List of dicts with the same keys add_track accepts
+        :return: List of DownloadedTrack rows, existing or newly inserted
+        """
+        if not tracks:
+            return []
         try:
-            with DatabaseContextManager() as session:
-                # Check if track already exists by track_id
-                existing_track = session.query(DownloadedTrack).filter_by(track_id=track_id).first()
-                
-                if existing_track:
-                    logger.info(f"Track already exists in database: {title}")
-                    # Update existing track with new information if needed
-                    if spotify_uri and not existing_track.spotify_uri:
-                        existing_track.spotify_uri = spotify_uri
-                    if youtube_id and not existing_track.youtube_id:
-                        existing_track.youtube_id = youtube_id
-                    if thumbnail_url and not existing_track.thumbnail_url:
-                        existing_track.thumbnail_url = thumbnail_url
-                    session.commit()
-                    return existing_track
-
-                # Create new track
-                track = DownloadedTrack(
-                    track_id=track_id,
-                    title=title,
-                    artist=artist,
-                    album=album,
-                    file_path=file_path,
-                    is_video=is_video,
-                    spotify_uri=spotify_uri if spotify_uri else None,  
-                    youtube_id=youtube_id,
-                    duration=duration,
-                    file_size=file_size,
-                    download_date=datetime.now(),
-                    audio_format=audio_format,
-                    audio_quality=audio_quality,
-                    thumbnail_url=thumbnail_url,
-                    download_source=download_source,
-                    subtitle_file=None if not has_subtitles else f"{os.path.splitext(file_path)[0]}.vtt",
-                    additional_metadata=additional_metadata
+            with db_session() as session:
+                ids = [t['track_id'] for t in tracks]
+                # Known ids are only needed for history accounting; the write
+                # itself is an UPSERT and never races the check
+                existing_ids = set()
+                for i in range(0, len(ids), 500):
+                    existing_ids.update(
+                        tid for (tid,) in session.query(DownloadedTrack.track_id)
+                        .filter(DownloadedTrack.track_id.in_(ids[i:i + 500])))
+
+                now = datetime.now()
+                rows = []
+                for spec in tracks:
+                    file_path = spec['file_path']
+                    rows.append({
+                        'track_id': spec['track_id'],
+                        'title': spec['title'],
+                        'artist': spec['artist'],
+                        'album': spec.get('album'),
+                        'file_path': file_path,
+                        'is_video': spec.get('is_video', False),
+                        'spotify_uri': spec.get('spotify_uri') or None,
+                        'youtube_id': spec.get('youtube_id'),
+                        'duration': spec.get('duration'),
+                        'file_size': spec.get('file_size'),
+                        'download_date': now,
+                        'audio_format': spec.get('audio_format'),
+                        'audio_quality': spec.get('audio_quality'),
+                        'thumbnail_url': spec.get('thumbnail_url'),
+                        'download_source': spec.get('download_source'),
+                        'subtitle_file': f"{os.path.splitext(file_path)[0]}.vtt" if spec.get('has_subtitles') else None,
+                        'additional_metadata': spec.get('additional_metadata')
+                    })
+
+                # One atomic statement: new tracks insert, already-known
+                # tracks keep their row and only fill in identifiers they
+                # were missing (COALESCE keeps existing values)
+                stmt = sqlite_insert(DownloadedTrack)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['track_id'],
+                    set_={
+                        'spotify_uri': func.coalesce(DownloadedTrack.spotify_uri, stmt.excluded.spotify_uri),
+                        'youtube_id': func.coalesce(DownloadedTrack.youtube_id, stmt.excluded.youtube_id),
+                        'thumbnail_url': func.coalesce(DownloadedTrack.thumbnail_url, stmt.excluded.thumbnail_url),
+                    }
                 )
+                session.execute(stmt, rows)
+
+                # Written ids must not be served stale from the lookup cache
+                with _TRACK_CACHE_LOCK:
+                    for tid in ids:
+                        _TRACK_CACHE.pop(tid, None)
+
+                new_specs = [s for s in tracks if s['track_id'] not in existing_ids]
+                if new_specs:
+                    # One aggregated history update for the whole batch, as a
+                    # server-side increment — no SELECT, and concurrent
+                    # writers can't lose each other's counts. init_db
+                    # guarantees the row exists. synchronize_session=False
+                    # skips the identity-map sweep: no DownloadHistory object
+                    # is ever loaded on this path.
+                    video_count = sum(1 for s in new_specs if s.get('is_video'))
+                    session.execute(update(DownloadHistory).execution_options(
+                        synchronize_session=False
+                    ).values(
+                        total_downloads=DownloadHistory.total_downloads + len(new_specs),
+                        total_video_downloads=DownloadHistory.total_video_downloads + video_count,
+                        total_audio_downloads=DownloadHistory.total_audio_downloads + (len(new_specs) - video_count),
+                        total_file_size=DownloadHistory.total_file_size + sum(s.get('file_size') or 0 for s in new_specs),
+                        last_download_date=now,
+                        spotify_downloads=DownloadHistory.spotify_downloads + sum(
+                            1 for s in new_specs if s.get('download_source') == 'Spotify'),
+                        youtube_downloads=DownloadHistory.youtube_downloads + sum(
+                            1 for s in new_specs if s.get('download_source') == 'YouTube')
+                    ))
+
+                    logger.info(f"Committed {len(new_specs)} new track(s) in one transaction")
+
+                # Load the affected rows back for callers that inspect them
+                results = []
+                for i in range(0, len(ids), 500):
+                    results.extend(
+                        session.query(DownloadedTrack)
+                        .filter(DownloadedTrack.track_id.in_(ids[i:i + 500])))
+                return results
 
-                try:
-                    # Add track to session
-                    session.add(track)
-                    session.flush()  
-                    logger.info(f"Added track to session, ID: {track.id}")
-                    
-                    # Update download history
-                    history = session.query(DownloadHistory).first()
-                    if history:
-                        history.total_downloads += 1
-                        if is_video:
-                            history.total_video_downloads += 1
-                        else:
-                            history.total_audio_downloads += 1
-                        history.total_file_size += file_size if file_size else 0
-                        history.last_download_date = datetime.now()
-                        if download_source == 'Spotify':
-                            history.spotify_downloads += 1
-                        elif download_source == 'YouTube':
-                            history.youtube_downloads += 1
-                    else:
-                        logger.warning("No download history found, creating new record")
-                        history = DownloadHistory(
-                            total_downloads=1,
-                            total_video_downloads=1 if is_video else 0,
-                            total_audio_downloads=0 if is_video else 1,
-                            total_file_size=file_size if file_size else 0,
-                            spotify_downloads=1 if download_source == 'Spotify' else 0,
-                            youtube_downloads=1 if download_source == 'YouTube' else 0,
-                            last_download_date=datetime.now()
-                        )
-                        session.add(history)
-                    
-                    # Commit the transaction
-                    session.commit()
-                    logger.info(f"Successfully committed track to database: {title}")
-                    return track
-                    
-                except SQLAlchemyError as e:
-                    session.rollback()
-                    logger.error(f"Database error while saving track {title}: {e}")
-                    logger.exception("Database error traceback:")
-                    return None
-
+        except SQLAlchemyError as e:
+            logger.error(f"Database error in bulk track insert: {e}")
+            logger.exception("Database error traceback:")
+            return []
         except Exception as e:
-            logger.error(f"Unexpected error adding track {title}: {e}")
+            logger.error(f"Unexpected error in bulk track insert: {e}")
             logger.exception("Full error traceback:")
-            return None
+            return []
+
+    @classmethod
+    def add_playlist_tracks_bulk(cls, playlist_id: int, track_ids: List[int]) -> bool:
+        """
+        Insert all of a playlist's track associations in one statement.
+
+        Uses a Core insert executed with a list of parameter dicts, which the
+        driver runs as a single executemany — one statement and one commit for
+        the whole import instead of an ORM flush per row.
+
+        :param playlist_id: Playlist primary key
+        :param track_ids: DownloadedTrack ids in playlist order
+        :return: True on success
+        """
+        if not track_ids:
+            return True
+        try:
+            with db_session() as session:
+                session.execute(
+                    insert(PlaylistTrack),
+                    [{'playlist_id': playlist_id, 'track_id': tid, 'position': i}
+                     for i, tid in enumerate(track_ids)]
+                )
+            return True
+        except SQLAlchemyError as e:
+            logger.error(f"Error bulk-inserting playlist tracks: {e}")
+            return False
 
     @staticmethod
     def get_track_by_id(track_id: str) -> Optional[DownloadedTrack]:
-        """Retrieve a track by its track_id."""
+        """Retrieve a track by its track_id, served from a short TTL cache."""
+        with _TRACK_CACHE_LOCK:
+            track = _TRACK_CACHE.get(track_id)
+        if track is not None:
+            return track
         try:
-            with DatabaseContextManager() as session:
-                return session.query(DownloadedTrack).filter_by(track_id=track_id).first()
+            with db_session() as session:
+                track = session.query(DownloadedTrack).filter_by(track_id=track_id).first()
+                if track is not None:
+                    # Detach the instance with its attributes still loaded
+                    # before the context-exit commit can expire them; a
+                    # cached hit served to a later request must not be a
+                    # session-bound object that Session.remove() has since
+                    # invalidated.
+                    session.expunge(track)
+                    with _TRACK_CACHE_LOCK:
+                        _TRACK_CACHE[track_id] = track
+                return track
         except SQLAlchemyError as e:
             logger.error(f"Error retrieving track: {e}")
             return None
 
     @staticmethod
     def search_tracks(
-        query: Optional[str] = None, 
-        artist: Optional[str] = None, 
+        query: Optional[str] = None,
+        artist: Optional[str] = None,
         album: Optional[str] = None,
-        is_video: Optional[bool] = None
+        is_video: Optional[bool] = None,
+        limit: int = 50,
+        offset: int = 0
     ) -> List[DownloadedTrack]:
         """
         Advanced track search with multiple filters.
-        
+
+        Results are paginated server-side so a typeahead only ever hydrates
+        `limit` ORM objects, and the engine's compiled-statement cache keeps
+        the repeated query shapes warm across calls.
+
         :param query: Search term across title, artist, album
         :param artist: Filter by artist
         :param album: Filter by album
         :param is_video: Filter by video/audio type
+        :param limit: Maximum number of rows to return
+        :param offset: Number of matching rows to skip
         :return: List of matching tracks
         """
         try:
-            with DatabaseContextManager() as session:
+            with read_session() as session:
                 search_query = session.query(DownloadedTrack)
-                
+
                 if query:
-                    search_query = search_query.filter(
-                        (DownloadedTrack.title.ilike(f'%{query}%')) | 
-                        (DownloadedTrack.artist.ilike(f'%{query}%')) |
-                        (DownloadedTrack.album.ilike(f'%{query}%'))
-                    )
-                
+                    # Resolve the free-text part through the FTS5 index; the
+                    # query is quoted (with embedded quotes doubled, FTS5's
+                    # escape) so user input can't be FTS syntax
+                    phrase = query.replace('"', '""')
+                    rowids = [r[0] for r in session.execute(
+                        text("SELECT rowid FROM tracks_fts WHERE tracks_fts MATCH :q LIMIT :lim"),
+                        {'q': f'"{phrase}"', 'lim': limit + offset}
+                    )]
+                    if not rowids:
+                        return []
+                    search_query = search_query.filter(DownloadedTrack.id.in_(rowids))
+
                 if artist:
                     search_query = search_query.filter(DownloadedTrack.artist.ilike(f'%{artist}%'))
-                
+
                 if album:
                     search_query = search_query.filter(DownloadedTrack.album.ilike(f'%{album}%'))
-                
+
                 if is_video is not None:
                     search_query = search_query.filter(DownloadedTrack.is_video == is_video)
-                
-                return search_query.all()
+
+                return search_query.limit(limit).offset(offset).all()
         except SQLAlchemyError as e:
             logger.error(f"Error searching tracks: {e}")
             return []
@@ -461,12 +774,15 @@ class DatabaseManager:
         :return: Dictionary of download statistics
         """
         try:
-            with DatabaseContextManager() as session:
+            with read_session() as session:
                 history = session.query(DownloadHistory).first()
-                
-                # Additional statistics
-                total_artists = session.query(func.count(DownloadedTrack.artist.distinct())).scalar()
-                total_albums = session.query(func.count(DownloadedTrack.album.distinct())).scalar()
+
+                # Both distinct counts in one statement, so SQLite scans the
+                # table once instead of twice
+                total_artists, total_albums = session.query(
+                    func.count(DownloadedTrack.artist.distinct()),
+                    func.count(DownloadedTrack.album.distinct())
+                ).one()
                 
                 return {
                     'total_downloads': history.total_downloads,
@@ -485,30 +801,53 @@ class DatabaseManager:
     def display_database_contents(cls):
         """Display all contents of the database for debugging purposes."""
         try:
-            with Session() as session:
-                # Display all tracks
+            with read_session() as session:
+                # Display all tracks. Rows stream in batches of 500 with only
+                # the printed columns loaded, so memory stays constant however
+                # large the catalog is; directories are scandir'd once each as
+                # they are first seen.
                 print("\n=== Downloaded Tracks ===")
-                tracks = session.query(DownloadedTrack).all()
-                if tracks:
-                    for track in tracks:
-                        print(f"\nTrack: {track.title}")
-                        print(f"Artist: {track.artist}")
-                        print(f"Album: {track.album}")
-                        print(f"File: {track.file_path}")
-                        print(f"Download Date: {track.download_date}")
-                        print(f"Is Video: {track.is_video}")
-                        print(f"File exists: {os.path.exists(track.file_path)}")
-                else:
+                tracks = session.query(DownloadedTrack).options(
+                    load_only(DownloadedTrack.title, DownloadedTrack.artist,
+                              DownloadedTrack.album, DownloadedTrack.file_path,
+                              DownloadedTrack.download_date, DownloadedTrack.is_video)
+                ).execution_options(stream_results=True).yield_per(500)
+                listings = {}
+                found_tracks = False
+                for track in tracks:
+                    found_tracks = True
+                    directory = os.path.dirname(track.file_path)
+                    if directory not in listings:
+                        try:
+                            listings[directory] = {e.name for e in os.scandir(directory)}
+                        except OSError:
+                            listings[directory] = set()
+                    present = listings[directory]
+                    print(f"\nTrack: {track.title}")
+                    print(f"Artist: {track.artist}")
+                    print(f"Album: {track.album}")
+                    print(f"File: {track.file_path}")
+                    print(f"Download Date: {track.download_date}")
+                    print(f"Is Video: {track.is_video}")
+                    print(f"File exists: {os.path.basename(track.file_path) in present}")
+                if not found_tracks:
                     print("No tracks found in database")
 
-                # Display all playlists
+                # Display all playlists. One GROUP BY supplies every track
+                # count instead of a COUNT query per playlist, and load_only
+                # skips the description/thumbnail text columns.
                 print("\n=== Playlists ===")
-                playlists = session.query(Playlist).all()
+                counts = dict(
+                    session.query(PlaylistTrack.playlist_id, func.count())
+                    .group_by(PlaylistTrack.playlist_id).all()
+                )
+                playlists = session.query(Playlist).options(
+                    load_only(Playlist.id, Playlist.name, Playlist.created_date)
+                ).all()
                 if playlists:
                     for playlist in playlists:
                         print(f"\nPlaylist: {playlist.name}")
-                        track_count = session.query(PlaylistTrack).filter_by(playlist_id=playlist.id).count()
-                        print(f"Track Count: {track_count}")
+                        print(f"Track Count: {counts.get(playlist.id, 0)}")
                         print(f"Created: {playlist.created_date}")
                 else:
                     print("No playlists found in database")
@@ -1,38 +1,56 @@
 import sys
 import os
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the src directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from database import DatabaseManager, DownloadedTrack
+from sqlalchemy import func
+
+from database import DatabaseManager, DownloadedTrack, ReadSession
+
+def _aggregate_counts():
+    """Total, distinct-artist and distinct-album counts from one table scan."""
+    try:
+        return ReadSession().query(
+            func.count(DownloadedTrack.id),
+            func.count(DownloadedTrack.artist.distinct()),
+            func.count(DownloadedTrack.album.distinct())
+        ).one()
+    finally:
+        ReadSession.remove()
+
+def _recent_tracks(limit=10):
+    try:
+        return ReadSession().query(DownloadedTrack)\
+            .order_by(DownloadedTrack.id.desc()).limit(limit).all()
+    finally:
+        ReadSession.remove()
 
 def inspect_db():
     """Interactive database inspection."""
-    session = DatabaseManager.get_session()
     try:
-        # Total tracks
-        total_tracks = session.query(DownloadedTrack).count()
+        # The three counts share a single scan, and the recent-tracks query
+        # runs on its own connection in parallel — under WAL the readers
+        # don't block each other, so total cost is one wall-clock scan
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            counts_future = pool.submit(_aggregate_counts)
+            recent_future = pool.submit(_recent_tracks)
+            total_tracks, unique_artists, unique_albums = counts_future.result()
+            recent_tracks = recent_future.result()
+
         print(f"Total Tracks: {total_tracks}")
-        
-        # Recent tracks
-        recent_tracks = session.query(DownloadedTrack).order_by(DownloadedTrack.id.desc()).limit(10)
+
         print("\nMost Recent Tracks:")
         for track in recent_tracks:
             print(f"ID: {track.id}, Title: {track.title}, Artist: {track.artist}, Album: {track.album}")
-        
-        # Unique artists
-        unique_artists = session.query(DownloadedTrack.artist).distinct().count()
+
         print(f"\nUnique Artists: {unique_artists}")
-        
-        # Unique albums
-        unique_albums = session.query(DownloadedTrack.album).distinct().count()
         print(f"Unique Albums: {unique_albums}")
-        
+
     except Exception as e:
         print(f"Error inspecting database: {e}")
-    finally:
-        session.close()
 
 def debug_track_saving():
     """
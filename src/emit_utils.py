@@ -1,8 +1,18 @@
+import atexit
+import time
+
 from flask_socketio import SocketIO
 
 # Global SocketIO instance
 socketio = None
 
+# Progress updates arrive from yt-dlp hooks many times per second; each emit
+# serializes the payload and walks every connected client. Updates within
+# _EMIT_INTERVAL of the last emit are coalesced to the latest value so clients
+# see ~10 updates/second, with terminal (100%) updates always sent through.
+_EMIT_INTERVAL = 0.1
+_last_emit = {'t': 0.0, 'pending': None}
+
 def set_socketio_instance(instance):
     """Set the global SocketIO instance"""
     global socketio
@@ -21,9 +31,29 @@ def emit_message(message, message_type="info"):
     else:
         print(f"SocketIO not initialized. Message: {message} ({message_type})")
 
+def _is_terminal(progress):
+    """Whether a progress payload marks the end of a download"""
+    if isinstance(progress, dict):
+        progress = progress.get('progress', 0)
+    try:
+        return float(progress) >= 100
+    except (TypeError, ValueError):
+        return False
+
 def emit_progress(progress):
-    """Emit progress through SocketIO if available"""
+    """Emit progress through SocketIO, coalescing high-frequency updates.
+
+    At most one emit goes out per _EMIT_INTERVAL; intermediate values are
+    replaced by newer ones rather than queued. Completion updates bypass
+    the throttle so the 100% event always reaches the client.
+    """
     if socketio:
+        now = time.monotonic()
+        _last_emit['pending'] = progress
+        if now - _last_emit['t'] < _EMIT_INTERVAL and not _is_terminal(progress):
+            return
+        _last_emit['t'] = now
+        _last_emit['pending'] = None
         try:
             socketio.emit('progress', {
                 'progress': progress
@@ -33,8 +63,21 @@ def emit_progress(progress):
     else:
         print(f"SocketIO not initialized. Progress: {progress}")
 
+def _flush_pending_progress():
+    """Send any progress update still held back by the throttle"""
+    pending = _last_emit['pending']
+    if pending is not None and socketio:
+        _last_emit['pending'] = None
+        try:
+            socketio.emit('progress', {'progress': pending})
+        except Exception as e:
+            print(f"Error emitting progress: {str(e)}")
+
+atexit.register(_flush_pending_progress)
+
 def emit_download_complete(data):
     """Emit download complete through SocketIO if available"""
+    _flush_pending_progress()
     if socketio:
         try:
             socketio.emit('download_complete', data)
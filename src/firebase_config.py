@@ -4,15 +4,66 @@ import firebase_admin
 from firebase_admin import credentials, firestore
 from google.oauth2 import id_token
 from google.auth.transport import requests
+import requests as requests_lib
+import hashlib
 import logging
+import threading
+import time
+from cachetools import TTLCache
 from dotenv import load_dotenv
 
+try:
+    import cachecontrol
+except ImportError:  # pragma: no cover - optional speedup
+    cachecontrol = None
+
+try:
+    import jwt as pyjwt
+except ImportError:  # pragma: no cover - optional speedup
+    pyjwt = None
+
 # Load environment variables
 load_dotenv()
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# One transport for all token verifications. Google rotates its signing
+# certs roughly daily, so wrapping the session in cachecontrol lets the
+# JWKS response be served from cache instead of a fresh HTTPS round trip
+# on every login; the pooled adapter keeps connections (and their TLS
+# handshakes) warm for the refreshes that do go to the network.
+_cert_session = requests_lib.Session()
+_cert_session.mount('https://', requests_lib.adapters.HTTPAdapter(
+    pool_connections=4, pool_maxsize=32))
+if cachecontrol is not None:
+    _cert_session = cachecontrol.CacheControl(_cert_session)
+_auth_request = requests.Request(session=_cert_session)
+
+# Verified-token cache: the same ID token arrives with every request from a
+# logged-in browser session, and each RSA signature verification costs
+# hundreds of microseconds of CPU. Entries are keyed by a token digest (not
+# the token itself) and re-checked against exp before being served.
+_token_cache = TTLCache(maxsize=4096, ttl=300)
+_token_cache_lock = threading.Lock()
+_EXP_SLACK = 30  # seconds before expiry at which a cached token is re-verified
+
+# Issuers Google is allowed to sign tokens as; frozenset for O(1) membership
+# on the per-request auth path
+_VALID_ISSUERS = frozenset({'accounts.google.com', 'https://accounts.google.com'})
+
+# When PyJWT is installed, tokens are verified fully offline against
+# Google's JWKS, which PyJWKClient fetches through its own day-long key
+# cache — no per-verify HTTP and a faster RSA check than google-auth's path.
+_jwks_client = None
+if pyjwt is not None:
+    try:
+        _jwks_client = pyjwt.PyJWKClient(
+            'https://www.googleapis.com/oauth2/v3/certs',
+            cache_keys=True, lifespan=86400)
+    except Exception as e:  # pragma: no cover - defensive
+        logger.error(f"Error building JWKS client: {e}")
+
 def init_firebase():
     """Initialize Firebase with error handling"""
     try:
@@ -41,26 +92,56 @@ def init_firebase():
         raise
 
 def verify_google_token(token):
-    """Verify Google ID token"""
+    """Verify Google ID token, serving repeats from the verified-token cache"""
     try:
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        with _token_cache_lock:
+            cached = _token_cache.get(key)
+        if cached is not None:
+            idinfo, exp = cached
+            if time.time() < exp - _EXP_SLACK:
+                return idinfo
+            with _token_cache_lock:
+                _token_cache.pop(key, None)
+
         # Get client ID from environment variable or config
         client_id = os.getenv('GOOGLE_CLIENT_ID', '994704832149-i9sff9ergovs86n0nt0vkburkcp9m1ai.apps.googleusercontent.com')
-        
-        # Verify the token
-        idinfo = id_token.verify_oauth2_token(token, requests.Request(), client_id)
-        
-        if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
+
+        # Verify the token: offline via PyJWT's cached JWKS when available,
+        # otherwise through google-auth's verifier on the shared transport
+        if _jwks_client is not None:
+            signing_key = _jwks_client.get_signing_key_from_jwt(token)
+            idinfo = pyjwt.decode(
+                token, signing_key.key, algorithms=['RS256'], audience=client_id)
+        else:
+            idinfo = id_token.verify_oauth2_token(token, _auth_request, client_id)
+
+        if idinfo['iss'] not in _VALID_ISSUERS:
             raise ValueError('Invalid issuer')
-            
+
+        with _token_cache_lock:
+            _token_cache[key] = (idinfo, idinfo.get('exp', 0))
         return idinfo
     except Exception as e:
         logger.error(f"Error verifying Google token: {e}")
         return None
 
-# Initialize Firestore client
-try:
-    db = init_firebase()
-    logger.info("Firestore client initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize Firestore client: {e}")
-    db = None
+# Firestore client, built lazily on first attribute access (PEP 562).
+# Importing this module no longer pays gRPC channel setup and credential
+# loading up front, and imports don't fail outright when credentials are
+# missing in dev — `db` just resolves to None, as before.
+_db = None
+_db_init_failed = False
+
+def __getattr__(name):
+    global _db, _db_init_failed
+    if name == 'db':
+        if _db is None and not _db_init_failed:
+            try:
+                _db = init_firebase()
+                logger.info("Firestore client initialized successfully")
+            except Exception as e:
+                logger.error(f"Failed to initialize Firestore client: {e}")
+                _db_init_failed = True
+        return _db
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,26 +1,85 @@
 import firebase_admin
 from firebase_admin import credentials, firestore
+from google.cloud.firestore_v1.field_path import FieldPath
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
 from datetime import datetime
 import os
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Idempotent Admin SDK init: after the first call this is a boolean check,
+# not a peek into firebase_admin._apps plus a possible credentials-file read
+_admin_initialized = False
+
+def _ensure_admin_init():
+    global _admin_initialized
+    if _admin_initialized:
+        return
+    if not firebase_admin._apps:
+        # Initialize Firebase Admin SDK
+        cred = credentials.Certificate('firebase-credentials.json')
+        firebase_admin.initialize_app(cred)
+    _admin_initialized = True
+
+# Which additional_metadata keys hold datetimes, keyed by the dict's key
+# set: metadata shapes repeat across an import, so after the first track of
+# a shape the conversion loop only touches the keys that need it
+_datetime_keys_cache = {}
+
+def _convert_metadata_datetimes(metadata):
+    """Convert datetime values in a metadata dict to ISO strings, in place"""
+    shape = frozenset(metadata)
+    keys = _datetime_keys_cache.get(shape)
+    if keys is None:
+        keys = tuple(k for k, v in metadata.items() if isinstance(v, datetime))
+        _datetime_keys_cache[shape] = keys
+    for key in keys:
+        value = metadata.get(key)
+        if isinstance(value, datetime):
+            metadata[key] = value.isoformat()
+
+def _doc_to_dict(doc):
+    """Decode a document and tag it with its id in place — one dict, no merge"""
+    data = doc.to_dict()
+    data['id'] = doc.id
+    return data
+
 class FirebaseService:
     _instance = None
-    
-    def __init__(self):
-        if not firebase_admin._apps:
-            # Initialize Firebase Admin SDK
-            cred = credentials.Certificate('firebase-credentials.json')
-            firebase_admin.initialize_app(cred)
-        
+    _instance_lock = threading.Lock()
+
+    # Short-lived playlist document cache; popular playlists get hit on every
+    # GET/POST/DELETE just for an existence check, so serve that from memory
+    _playlist_cache = TTLCache(maxsize=4096, ttl=60)
+
+    def __init__(self, db=None):
+        # Reuse an injected client (and its gRPC channel pool) when one is
+        # available; only build our own as a last resort
+        if db is not None:
+            self.db = db
+            return
+        _ensure_admin_init()
         self.db = firestore.client()
-        
+
     @classmethod
     def get_instance(cls):
+        # Double-checked locking: concurrent first callers race the lock
+        # once, everyone after that takes the lock-free fast path
         if cls._instance is None:
-            cls._instance = cls()
+            with cls._instance_lock:
+                if cls._instance is None:
+                    shared_db = None
+                    try:
+                        # Share the client firebase_config already built so
+                        # the process runs one gRPC channel pool, not two
+                        import firebase_config
+                        shared_db = firebase_config.db
+                    except Exception:
+                        pass
+                    cls._instance = cls(db=shared_db)
         return cls._instance
     
     def add_track(self, track_data):
@@ -32,10 +91,8 @@ class FirebaseService:
             
             # Convert any other datetime objects in additional_metadata
             if 'additional_metadata' in track_data:
-                for key, value in track_data['additional_metadata'].items():
-                    if isinstance(value, datetime):
-                        track_data['additional_metadata'][key] = value.isoformat()
-            
+                _convert_metadata_datetimes(track_data['additional_metadata'])
+
             # Add the track to Firestore
             doc_ref = self.db.collection('tracks').document()
             doc_ref.set(track_data)
@@ -45,16 +102,121 @@ class FirebaseService:
             logger.error(f"Error adding track to Firestore: {e}")
             return None
     
-    def get_all_tracks(self):
-        """Get all tracks from Firestore"""
+    def add_tracks_bulk(self, tracks_data):
+        """Add many tracks to Firestore in chunked batch commits.
+
+        Writes go through WriteBatch in chunks of 500 (Firestore's per-batch
+        op limit), so an N-track import costs ceil(N/500) round trips
+        instead of N and each chunk commits atomically. Returns the new
+        document ids in input order.
+        """
+        try:
+            doc_ids = []
+            for i in range(0, len(tracks_data), 500):
+                batch = self.db.batch()
+                for track_data in tracks_data[i:i + 500]:
+                    if isinstance(track_data.get('download_date'), datetime):
+                        track_data['download_date'] = firestore.SERVER_TIMESTAMP
+                    if 'additional_metadata' in track_data:
+                        _convert_metadata_datetimes(track_data['additional_metadata'])
+                    doc_ref = self.db.collection('tracks').document()
+                    batch.set(doc_ref, track_data)
+                    doc_ids.append(doc_ref.id)
+                batch.commit()
+            return doc_ids
+        except Exception as e:
+            logger.error(f"Error bulk-adding tracks to Firestore: {e}")
+            return []
+
+    def get_track_by_id(self, track_id):
+        """Get a single track from Firestore by document id"""
+        try:
+            doc = self.db.collection('tracks').document(track_id).get()
+            if doc.exists:
+                track_data = doc.to_dict()
+                track_data['id'] = doc.id
+                return track_data
+            return None
+        except Exception as e:
+            logger.error(f"Error getting track from Firestore: {e}")
+            return None
+
+    def get_all_tracks(self, fields=None):
+        """Get all tracks from Firestore, optionally projecting fields.
+
+        Passing fields pushes a select() down to the query so only those
+        fields cross the wire and get decoded — documents with a large
+        additional_metadata blob stop dominating the payload. Callers that
+        need the full document go through get_track_by_id.
+        """
         try:
             tracks_ref = self.db.collection('tracks')
+            if fields:
+                tracks_ref = tracks_ref.select(fields)
             docs = tracks_ref.order_by('download_date', direction=firestore.Query.DESCENDING).stream()
-            return [doc.to_dict() | {'id': doc.id} for doc in docs]
+            return [_doc_to_dict(doc) for doc in docs]
         except Exception as e:
             logger.error(f"Error getting tracks from Firestore: {e}")
             return []
     
+    def get_tracks_page(self, page_size=50, start_after=None, fields=None):
+        """Get one page of tracks plus a cursor for the next page.
+
+        Pages are keyed by a document-id cursor (start_after) rather than an
+        offset, so each call reads exactly page_size documents no matter how
+        deep into the collection it lands. Returns (tracks, next_cursor);
+        next_cursor is None when the collection is exhausted.
+        """
+        try:
+            query = self.db.collection('tracks')\
+                .order_by('download_date', direction=firestore.Query.DESCENDING)
+            if fields:
+                query = query.select(fields)
+            if start_after:
+                cursor_doc = self.db.collection('tracks').document(start_after).get()
+                if cursor_doc.exists:
+                    query = query.start_after(cursor_doc)
+            docs = list(query.limit(page_size).stream())
+            tracks = [_doc_to_dict(doc) for doc in docs]
+            next_cursor = docs[-1].id if len(docs) == page_size else None
+            return tracks, next_cursor
+        except Exception as e:
+            logger.error(f"Error getting tracks page from Firestore: {e}")
+            return [], None
+
+    def iter_all_tracks(self, page_size=500, fields=None):
+        """Yield every track lazily, one cursor-keyed page at a time.
+
+        Streaming consumers (CLI listings, exports) hold a single page of
+        documents in memory instead of materializing the collection the
+        way get_all_tracks does.
+        """
+        cursor = None
+        while True:
+            tracks, cursor = self.get_tracks_page(
+                page_size=page_size, start_after=cursor, fields=fields)
+            yield from tracks
+            if cursor is None:
+                break
+
+    def get_playlists_page(self, page_size=50, start_after=None, fields=None):
+        """Get one page of playlists plus a cursor for the next page."""
+        try:
+            query = self.db.collection('playlists').order_by('__name__')
+            if fields:
+                query = query.select(fields)
+            if start_after:
+                cursor_doc = self.db.collection('playlists').document(start_after).get()
+                if cursor_doc.exists:
+                    query = query.start_after(cursor_doc)
+            docs = list(query.limit(page_size).stream())
+            playlists = [_doc_to_dict(doc) for doc in docs]
+            next_cursor = docs[-1].id if len(docs) == page_size else None
+            return playlists, next_cursor
+        except Exception as e:
+            logger.error(f"Error getting playlists page from Firestore: {e}")
+            return [], None
+
     def delete_track(self, track_id):
         """Delete a track from Firestore"""
         try:
@@ -64,10 +226,18 @@ class FirebaseService:
             logger.error(f"Error deleting track from Firestore: {e}")
             return False
     
-    def update_track(self, track_id, track_data):
-        """Update a track in Firestore"""
+    def update_track(self, track_id, track_data, fields=None):
+        """Update a track in Firestore, optionally masked to specific fields.
+
+        Passing fields sends only those keys, so callers holding a full
+        track dict don't rewrite (and re-index) every field to change one.
+        """
         try:
-            self.db.collection('tracks').document(track_id).update(track_data)
+            payload = {k: track_data[k] for k in fields if k in track_data} \
+                if fields else track_data
+            if not payload:
+                return True
+            self.db.collection('tracks').document(track_id).update(payload)
             return True
         except Exception as e:
             logger.error(f"Error updating track in Firestore: {e}")
@@ -83,47 +253,237 @@ class FirebaseService:
             logger.error(f"Error adding playlist to Firestore: {e}")
             return None
     
-    def get_all_playlists(self):
-        """Get all playlists from Firestore"""
+    def get_all_playlists(self, fields=None):
+        """Get all playlists from Firestore, optionally projecting fields.
+
+        Passing fields pushes a select() down to the query so only those
+        fields cross the wire and get decoded.
+        """
         try:
             playlists_ref = self.db.collection('playlists')
+            if fields:
+                playlists_ref = playlists_ref.select(fields)
             docs = playlists_ref.stream()
-            return [doc.to_dict() | {'id': doc.id} for doc in docs]
+            return [_doc_to_dict(doc) for doc in docs]
         except Exception as e:
             logger.error(f"Error getting playlists from Firestore: {e}")
             return []
     
-    def add_track_to_playlist(self, playlist_id, track_id):
-        """Add a track to a playlist"""
+    def get_all_playlists_with_counts(self, ids=None, fields=None):
+        """Get playlists (optionally restricted to ids) with track counts.
+
+        Ids are resolved in chunked documentId() 'in' queries (Firestore caps
+        'in' filters at 30 values) and the counts come from server-side
+        count() aggregations run in parallel, so no playlist costs a full
+        subcollection read.
+        """
         try:
+            if ids is None:
+                playlists = self.get_all_playlists(fields=fields)
+            else:
+                chunks = [ids[i:i + 30] for i in range(0, len(ids), 30)]
+
+                def fetch_chunk(chunk):
+                    query = self.db.collection('playlists')\
+                        .where(FieldPath.document_id(), 'in', chunk)
+                    if fields:
+                        query = query.select(fields)
+                    docs = query.stream()
+                    return [_doc_to_dict(doc) for doc in docs]
+
+                playlists = []
+                with ThreadPoolExecutor(max_workers=8) as pool:
+                    for part in pool.map(fetch_chunk, chunks):
+                        playlists.extend(part)
+
+            def attach_count(playlist):
+                agg = self.db.collection('playlists').document(playlist['id'])\
+                    .collection('tracks').count().get()
+                playlist['track_count'] = int(agg[0][0].value)
+                return playlist
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                return list(pool.map(attach_count, playlists))
+        except Exception as e:
+            logger.error(f"Error getting playlists with counts: {e}")
+            return []
+
+    # Fields denormalized into each playlist entry so a playlist view reads
+    # only the subcollection — no second hop to the tracks collection
+    _SNAPSHOT_FIELDS = ['title', 'artist', 'album', 'duration']
+
+    def add_track_to_playlist(self, playlist_id, track_id, track_data=None):
+        """Add a track to a playlist with a denormalized display snapshot.
+
+        The entry carries the track's display fields so get_playlist_tracks
+        never needs to dereference the tracks collection; pass track_data to
+        skip the lookup when the caller already holds the track.
+        """
+        try:
+            if track_data is None:
+                doc = self.db.collection('tracks').document(track_id)\
+                    .get(field_paths=self._SNAPSHOT_FIELDS)
+                track_data = doc.to_dict() if doc.exists else {}
             playlist_track = {
                 'track_id': track_id,
+                'snapshot': {k: track_data.get(k) for k in self._SNAPSHOT_FIELDS},
                 'added_date': firestore.SERVER_TIMESTAMP
             }
             self.db.collection('playlists').document(playlist_id)\
                 .collection('tracks').add(playlist_track)
+            self._invalidate_playlist(playlist_id)
             return True
         except Exception as e:
             logger.error(f"Error adding track to playlist: {e}")
             return False
     
-    def get_playlist_tracks(self, playlist_id):
-        """Get all tracks in a playlist"""
+    def get_playlist_cached(self, playlist_id):
+        """Get a playlist document through the in-process TTL cache"""
+        cached = self._playlist_cache.get(playlist_id)
+        if cached is not None:
+            return cached
         try:
-            tracks_ref = self.db.collection('playlists').document(playlist_id)\
-                .collection('tracks').order_by('added_date').stream()
-            track_ids = [doc.to_dict()['track_id'] for doc in tracks_ref]
-            
-            # Get track details
+            doc = self.db.collection('playlists').document(playlist_id).get()
+            if not doc.exists:
+                return None
+            playlist = doc.to_dict()
+            playlist['id'] = doc.id
+            self._playlist_cache[playlist_id] = playlist
+            return playlist
+        except Exception as e:
+            logger.error(f"Error getting playlist from Firestore: {e}")
+            return None
+
+    def _invalidate_playlist(self, playlist_id):
+        self._playlist_cache.pop(playlist_id, None)
+
+    def gather(self, *calls):
+        """Run independent Firestore reads concurrently and return results in order.
+
+        Thread-based equivalent of asyncio.gather for this codebase: the
+        synchronous client's gRPC calls release the GIL while waiting, so a
+        fan-out of M reads costs the slowest one instead of their sum. Each
+        call is a zero-argument callable (use functools.partial or a lambda
+        to bind arguments).
+        """
+        with ThreadPoolExecutor(max_workers=max(len(calls), 1)) as pool:
+            futures = [pool.submit(call) for call in calls]
+            return [f.result() for f in futures]
+
+    def get_playlist_with_tracks(self, playlist_id, track_fields=None):
+        """Fetch a playlist document and its tracks in one parallel round trip"""
+        try:
+            doc, tracks = self.gather(
+                self.db.collection('playlists').document(playlist_id).get,
+                lambda: self.get_playlist_tracks(playlist_id, track_fields))
+            if not doc.exists:
+                return None
+            playlist = doc.to_dict()
+            playlist['id'] = doc.id
+            playlist['tracks'] = tracks
+            return playlist
+        except Exception as e:
+            logger.error(f"Error getting playlist with tracks: {e}")
+            return None
+
+    def add_tracks_to_playlist(self, playlist_id, track_ids):
+        """Add several tracks to a playlist with one existence probe.
+
+        Existence is validated with chunked documentId() 'in' queries that
+        also project the snapshot fields, and all valid ids are committed in
+        a single batch write carrying their denormalized snapshots. Returns
+        an id -> bool success map.
+        """
+        try:
+            existing = {}
+            for i in range(0, len(track_ids), 30):
+                chunk = track_ids[i:i + 30]
+                docs = self.db.collection('tracks')\
+                    .where(FieldPath.document_id(), 'in', chunk)\
+                    .select(self._SNAPSHOT_FIELDS)\
+                    .stream()
+                existing.update({doc.id: doc.to_dict() for doc in docs})
+
+            if existing:
+                batch = self.db.batch()
+                tracks_ref = self.db.collection('playlists')\
+                    .document(playlist_id).collection('tracks')
+                for track_id, track_data in existing.items():
+                    batch.set(tracks_ref.document(), {
+                        'track_id': track_id,
+                        'snapshot': {k: track_data.get(k) for k in self._SNAPSHOT_FIELDS},
+                        'added_date': firestore.SERVER_TIMESTAMP
+                    })
+                batch.commit()
+                self._invalidate_playlist(playlist_id)
+            return {tid: tid in existing for tid in track_ids}
+        except Exception as e:
+            logger.error(f"Error adding tracks to playlist: {e}")
+            return {tid: False for tid in track_ids}
+
+    def get_playlists_containing_track(self, track_id):
+        """Get ids of all playlists that contain a track.
+
+        One indexed collection_group scan over every playlist's tracks
+        subcollection replaces a per-playlist probe — O(matches) instead of
+        O(playlists). Needs the (track_id, added_date) collection-group
+        index shipped in firestore.indexes.json.
+        """
+        try:
+            docs = self.db.collection_group('tracks')\
+                .where('track_id', '==', track_id)\
+                .order_by('added_date')\
+                .stream()
+            playlist_ids = []
+            for doc in docs:
+                playlist_ref = doc.reference.parent.parent
+                # The top-level tracks collection has no grandparent and is
+                # not a playlist membership entry
+                if playlist_ref is not None:
+                    playlist_ids.append(playlist_ref.id)
+            return playlist_ids
+        except Exception as e:
+            logger.error(f"Error finding playlists containing track: {e}")
+            return []
+
+    def get_playlist_tracks(self, playlist_id, fields=None):
+        """Get all tracks in a playlist, optionally projecting track fields.
+
+        Entries written with a denormalized snapshot are answered from the
+        subcollection alone — one query, zero track reads. Entries from
+        before snapshots existed fall back to one get_all round trip, then
+        everything is returned in playlist order.
+        """
+        try:
+            entries = [doc.to_dict() for doc in
+                       self.db.collection('playlists').document(playlist_id)
+                       .collection('tracks').order_by('added_date').stream()]
+            if not entries:
+                return []
+
             tracks = []
-            for track_id in track_ids:
-                track_doc = self.db.collection('tracks').document(track_id).get()
-                if track_doc.exists:
-                    track_data = track_doc.to_dict()
-                    track_data['id'] = track_doc.id
-                    tracks.append(track_data)
-            
-            return tracks
+            missing = []
+            for entry in entries:
+                track_id = entry['track_id']
+                snapshot = entry.get('snapshot')
+                if snapshot is not None:
+                    if fields:
+                        snapshot = {k: snapshot.get(k) for k in fields}
+                    tracks.append(snapshot | {'id': track_id})
+                else:
+                    missing.append(track_id)
+                    tracks.append(None)
+
+            if missing:
+                refs = [self.db.collection('tracks').document(tid) for tid in missing]
+                by_id = {}
+                for doc in self.db.get_all(refs, field_paths=fields):
+                    if doc.exists:
+                        by_id[doc.id] = _doc_to_dict(doc)
+                it = iter(missing)
+                tracks = [t if t is not None else by_id.get(next(it)) for t in tracks]
+
+            return [t for t in tracks if t is not None]
         except Exception as e:
             logger.error(f"Error getting playlist tracks: {e}")
             return []
@@ -1,13 +1,66 @@
+from flask import g, has_request_context
 from flask_login import UserMixin
 import logging
 import json
 import os
+import sqlite3
+import threading
 
 logger = logging.getLogger(__name__)
 
+# orjson parses several times faster than stdlib json and works in bytes;
+# the shim keeps stdlib as the fallback with one switch point (only the
+# one-time users.json migration still parses JSON)
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+except ImportError:  # pragma: no cover - fallback path
+    def _loads(data):
+        return json.loads(data)
+
+# The local store is a keyed sqlite table rather than a JSON blob: a lookup
+# or save touches one row instead of re-parsing and rewriting the whole
+# file, so cost stays O(1) as the user count grows.
+_users_lock = threading.Lock()
+_users_conn = None
+
+def _user_db():
+    """Lazily open the local user store, migrating legacy users.json once"""
+    global _users_conn
+    with _users_lock:
+        if _users_conn is not None:
+            return _users_conn
+        os.makedirs('data', exist_ok=True)
+        conn = sqlite3.connect(User.LOCAL_DB_PATH, check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS users("
+            "id TEXT PRIMARY KEY, email TEXT, name TEXT, profile_pic TEXT)"
+        )
+        conn.commit()
+        if os.path.exists(User.LEGACY_JSON_PATH):
+            try:
+                with open(User.LEGACY_JSON_PATH, 'rb') as f:
+                    legacy = _loads(f.read())
+                conn.executemany(
+                    "INSERT OR IGNORE INTO users(id, email, name, profile_pic) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(uid, u.get('email'), u.get('name'), u.get('profile_pic'))
+                     for uid, u in legacy.items()]
+                )
+                conn.commit()
+                os.replace(User.LEGACY_JSON_PATH, User.LEGACY_JSON_PATH + '.migrated')
+                logger.info(f"Migrated {len(legacy)} user(s) from users.json")
+            except Exception as e:
+                logger.error(f"Error migrating legacy users.json: {e}")
+        _users_conn = conn
+        return conn
+
 class User(UserMixin):
-    # Local storage path for development
-    LOCAL_STORAGE_PATH = 'data/users.json'
+    # Local storage paths for development
+    LOCAL_DB_PATH = 'data/users.sqlite'
+    LEGACY_JSON_PATH = 'data/users.json'
 
     def __init__(self, user_id, email, name=None, profile_pic=None):
         self.id = user_id
@@ -16,31 +69,31 @@ class User(UserMixin):
         self.profile_pic = profile_pic
 
     @staticmethod
-    def _ensure_local_storage():
-        """Ensure local storage directory and file exist"""
-        os.makedirs('data', exist_ok=True)
-        if not os.path.exists(User.LOCAL_STORAGE_PATH):
-            with open(User.LOCAL_STORAGE_PATH, 'w') as f:
-                json.dump({}, f)
-
-    @staticmethod
-    def _get_local_users():
-        """Get users from local storage"""
-        User._ensure_local_storage()
+    def _get_local_user(user_id):
+        """Get one user from local storage by keyed lookup"""
         try:
-            with open(User.LOCAL_STORAGE_PATH, 'r') as f:
-                return json.load(f)
+            conn = _user_db()
+            with _users_lock:
+                row = conn.execute(
+                    "SELECT email, name, profile_pic FROM users WHERE id = ?",
+                    (user_id,)
+                ).fetchone()
+            return row
         except Exception as e:
             logger.error(f"Error reading local storage: {e}")
-            return {}
+            return None
 
-    @staticmethod
-    def _save_local_users(users):
-        """Save users to local storage"""
-        User._ensure_local_storage()
+    def _save_local_user(self):
+        """Save this user to local storage — one upserted row"""
         try:
-            with open(User.LOCAL_STORAGE_PATH, 'w') as f:
-                json.dump(users, f)
+            conn = _user_db()
+            with _users_lock:
+                conn.execute(
+                    "INSERT OR REPLACE INTO users(id, email, name, profile_pic) "
+                    "VALUES (?, ?, ?, ?)",
+                    (self.id, self.email, self.name, self.profile_pic)
+                )
+                conn.commit()
             return True
         except Exception as e:
             logger.error(f"Error writing to local storage: {e}")
@@ -48,6 +101,25 @@ class User(UserMixin):
 
     @staticmethod
     def get(user_id, db):
+        try:
+            # Flask-Login can call load_user several times in one request;
+            # memoize on flask.g so the Firestore doc-get happens once. g is
+            # torn down with the request, so there is no stale-data window.
+            if has_request_context():
+                cache = g.setdefault('_user_cache', {})
+                if user_id in cache:
+                    return cache[user_id]
+
+            user = User._fetch(user_id, db)
+            if user is not None and has_request_context():
+                g._user_cache[user_id] = user
+            return user
+        except Exception as e:
+            logger.error(f"Error getting user: {e}")
+            return None
+
+    @staticmethod
+    def _fetch(user_id, db):
         try:
             # Try Firestore first
             if db:
@@ -65,14 +137,14 @@ class User(UserMixin):
                     logger.error(f"Error getting user from Firestore: {e}")
 
             # Fallback to local storage
-            users = User._get_local_users()
-            if user_id in users:
-                user_data = users[user_id]
+            row = User._get_local_user(user_id)
+            if row is not None:
+                email, name, profile_pic = row
                 return User(
                     user_id=user_id,
-                    email=user_data.get('email'),
-                    name=user_data.get('name'),
-                    profile_pic=user_data.get('profile_pic')
+                    email=email,
+                    name=name,
+                    profile_pic=profile_pic
                 )
             return None
         except Exception as e:
@@ -93,13 +165,7 @@ class User(UserMixin):
                     logger.error(f"Error saving user to Firestore: {e}")
 
             # Always save to local storage as backup
-            users = User._get_local_users()
-            users[self.id] = {
-                'email': self.email,
-                'name': self.name,
-                'profile_pic': self.profile_pic
-            }
-            return User._save_local_users(users)
+            return self._save_local_user()
         except Exception as e:
             logger.error(f"Error saving user: {e}")
             return False
@@ -1,41 +1,39 @@
 import html
 import urllib.parse
 
+# Normalizes Windows separators in one C-level pass
+_BS_TRANS = str.maketrans('\\', '/')
+
 def encode_file_path(path):
     """
     Encode file path for safe use in HTML and URLs
-    
+
     Args:
         path (str): Original file path
-    
+
     Returns:
-        str: Encoded file path with HTML entities and URL encoding
+        str: Encoded file path
+
+    quote() output never contains the characters html.escape rewrites
+    (&, <, >, quotes), so the old escape pass was an identity copy and
+    is dropped; the whole encode is now one translate plus one quote.
     """
-    # First, replace backslashes with forward slashes for consistency
-    path = path.replace('\\', '/')
-    
-    # URL encode the path
-    url_encoded_path = urllib.parse.quote(path)
-    
-    # Convert to HTML entities for additional safety
-    html_encoded_path = html.escape(url_encoded_path)
-    
-    return html_encoded_path
+    return urllib.parse.quote(path.translate(_BS_TRANS))
 
 def decode_file_path(encoded_path):
     """
     Decode file path from HTML entities and URL encoding
-    
+
     Args:
         encoded_path (str): Encoded file path
-    
+
     Returns:
         str: Original file path
     """
-    # Unescape HTML entities
-    html_decoded_path = html.unescape(encoded_path)
-    
+    # Unescaping only does work when an entity can be present; skip the
+    # allocation for the common entity-free path
+    if '&' in encoded_path:
+        encoded_path = html.unescape(encoded_path)
+
     # URL decode the path
-    path = urllib.parse.unquote(html_decoded_path)
-    
-    return path
+    return urllib.parse.unquote(encoded_path)